@@ -291,10 +291,6 @@ def run_supply_watchdog():
     """Execute Workflow A and store results."""
     with st.spinner("Running Supply Watchdog... This may take a few moments."):
         try:
-            # Force fresh orchestrator instance to pick up code changes
-            import src.workflows.orchestrator as orch_module
-            orch_module._orchestrator_instance = None
-            
             from src.workflows import get_orchestrator
             orchestrator = get_orchestrator()
             result = orchestrator.run_supply_watchdog(trigger_type="manual")
@@ -457,7 +453,7 @@ def export_json_results():
         return
     
     result = st.session_state.workflow_a_result
-    json_string = result.get("json_string", json.dumps(result.get("output", {}), indent=2))
+    json_string = result.get("json_string") or json.dumps(result.get("output", {}), indent=2)
     
     st.download_button(
         label="Download JSON",
@@ -529,14 +525,26 @@ def show_conversational_assistant():
         # Generate response
         with st.chat_message("assistant"):
             with st.spinner("🤔 Thinking..."):
-                response = process_conversational_query(prompt)
-                
+                response = process_conversational_query(prompt, stream=True)
+            
+            content = response["content"]
+            if content is None:
+                response["content"] = "I couldn't generate a response. Please try again."
                 st.markdown(response["content"])
-                
-                if response.get("citations"):
-                    with st.expander("📚 Data Sources"):
-                        for citation in response["citations"]:
-                            st.caption(f"• {citation.get('table', 'Unknown table')}")
+            elif isinstance(content, str):
+                st.markdown(content)
+            else:
+                # Render LLM tokens as they arrive
+                try:
+                    response["content"] = st.write_stream(content)
+                except Exception as e:
+                    response["content"] = f"Error generating response: {str(e)}"
+                    st.error(response["content"])
+            
+            if response.get("citations"):
+                with st.expander("📚 Data Sources"):
+                    for citation in response["citations"]:
+                        st.caption(f"• {citation.get('table', 'Unknown table')}")
         
         # Add assistant message
         st.session_state.messages.append({
@@ -552,16 +560,12 @@ def show_conversational_assistant():
             st.rerun()
 
 
-def process_conversational_query(query: str) -> dict:
+def process_conversational_query(query: str, stream: bool = False) -> dict:
     """Process user query through Workflow B."""
     try:
-        # Force fresh orchestrator instance to pick up code changes
-        import src.workflows.orchestrator as orch_module
-        orch_module._orchestrator_instance = None
-        
         from src.workflows import get_orchestrator
         orchestrator = get_orchestrator()
-        result = orchestrator.run_scenario_strategist(query)
+        result = orchestrator.run_scenario_strategist(query, stream=stream)
         
         if result.get("success"):
             return {
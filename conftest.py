@@ -0,0 +1,218 @@
+"""
+Pytest configuration for the Clinical Supply Chain Control Tower.
+
+Keeping this file at the repository root makes pytest put the root on
+sys.path once at collection, so tests import the application as `src.*`
+without modifying sys.path themselves. Shared stubs and fixtures live
+here so tests never need a live database or OpenAI access.
+"""
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import psycopg2
+import pytest
+
+from src.agents.synthesis_agent import SynthesisAgent
+from src.config.settings import settings
+from src.tools.database_tools import DatabaseTools
+
+
+class FakeCursor:
+    """Cursor that answers SELECTs with one row and fails on 'BAD'."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self.rowcount = 0
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if self.conn.dead:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.conn.executed.append(query)
+        if "BAD" in query:
+            raise psycopg2.ProgrammingError("syntax error")
+        if query.lstrip().upper().startswith(("SELECT", "WITH")) or "RETURNING" in query:
+            self.description = [("a",)]
+            self._rows = [{"a": 1}]
+        else:
+            self.rowcount = 1
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    """psycopg2 connection stand-in that records executed statements."""
+
+    def __init__(self, dead=False):
+        self.closed = 0
+        self.dead = dead
+        self.executed = []
+
+    def cursor(self, name=None, cursor_factory=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.executed.append("COMMIT")
+
+    def rollback(self):
+        self.executed.append("ROLLBACK")
+
+
+class FakePool:
+    """Hands out the given connections in order and records returns."""
+
+    def __init__(self, conns):
+        self.conns = list(conns)
+        self.returned = []
+
+    def getconn(self):
+        return self.conns.pop(0)
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """DatabaseTools wired to one fake connection, with the query cache on."""
+    tools = DatabaseTools()
+    conn = FakeConnection()
+
+    @contextmanager
+    def get_connection():
+        yield conn
+
+    monkeypatch.setattr(tools, "get_connection", get_connection)
+    monkeypatch.setattr(settings, "query_cache_ttl", 60)
+    tools.conn = conn
+    return tools
+
+
+@pytest.fixture
+def pooled_db(monkeypatch):
+    """
+    Factory for DatabaseTools backed by a fake pool.
+
+    Takes one dead flag per pooled connection and the number of pool slots;
+    returns the tools and the pool.
+    """
+    def make(dead=(False,), max_connections=1):
+        tools = DatabaseTools()
+        pool = FakePool(FakeConnection(dead=flag) for flag in dead)
+        slots = threading.BoundedSemaphore(max_connections)
+        monkeypatch.setattr(tools, "_get_pool", lambda: (pool, slots))
+        return tools, pool
+
+    return make
+
+
+class StubLLM:
+    """Streams the given chunks, then raises if an error is set."""
+
+    def __init__(self, chunks=(), error=None):
+        self.chunks = chunks
+        self.error = error
+
+    def stream(self, prompt):
+        for content in self.chunks:
+            yield SimpleNamespace(content=content)
+        if self.error:
+            raise self.error
+
+
+@pytest.fixture
+def synthesis_agent():
+    """
+    Factory for a SynthesisAgent whose LLM streams the given chunks.
+
+    Skips __init__, so no LLM client is created.
+    """
+    def make(chunks=(), error=None):
+        agent = SynthesisAgent.__new__(SynthesisAgent)
+        agent.llm = StubLLM(chunks, error)
+        return agent
+
+    return make
+
+
+class StubCollection:
+    """In-memory stand-in for a ChromaDB collection."""
+
+    def __init__(self, embeddings, documents=None):
+        self.embeddings = dict(embeddings)
+        self.documents = dict(documents or {})
+        self.metadatas = {table: {"table_name": table} for table in self.embeddings}
+        self.upserted = []
+
+    def count(self):
+        return len(self.embeddings)
+
+    def get(self, include=None):
+        return {
+            "ids": list(self.embeddings),
+            "embeddings": list(self.embeddings.values()),
+            "documents": [self.documents.get(table) for table in self.embeddings],
+            "metadatas": [self.metadatas[table] for table in self.embeddings],
+        }
+
+    def update(self, ids, metadatas):
+        self.metadatas.update(zip(ids, metadatas))
+
+    def upsert(self, ids, documents, embeddings, metadatas):
+        self.upserted.extend(ids)
+        self.embeddings.update(zip(ids, embeddings))
+        self.documents.update(zip(ids, documents))
+        self.metadatas.update(zip(ids, metadatas))
+
+    def delete(self, ids):
+        for table in ids:
+            del self.embeddings[table]
+
+
+class StubEmbeddings:
+    """Embeds text as [length, 1.0] and records each API call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def create(self, model, input):
+        self.calls.append(list(input))
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[float(len(text)), 1.0]) for text in input])
+
+
+@pytest.fixture
+def chroma_manager(tmp_path):
+    """
+    Factory for a ChromaSchemaManagerOpenAI over a stub collection.
+
+    Takes the stored embeddings (and optionally documents) by table name.
+    Skips __init__, so neither ChromaDB nor OpenAI is contacted; managers
+    made by one test share the query embedding disk cache in tmp_path.
+    """
+    pytest.importorskip("chromadb")
+    pytest.importorskip("openai")
+    from src.utils.chroma_schema_manager_openai import ChromaSchemaManagerOpenAI
+
+    def make(embeddings=None, documents=None):
+        manager = ChromaSchemaManagerOpenAI.__new__(ChromaSchemaManagerOpenAI)
+        manager.embedding_model = "text-embedding-3-small"
+        manager.collection = StubCollection(embeddings or {}, documents)
+        manager.openai_client = SimpleNamespace(embeddings=StubEmbeddings())
+        manager._query_embedding_cache = OrderedDict()
+        manager._query_cache_lock = threading.Lock()
+        manager._query_db_path = str(tmp_path / ChromaSchemaManagerOpenAI.QUERY_EMBEDDING_DB)
+        manager._schema_index = None
+        manager._schema_index_lock = threading.Lock()
+        return manager
+
+    return make
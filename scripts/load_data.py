@@ -142,9 +142,10 @@ def main():
             """))
             tables = [row[0] for row in result]
             
-            logger.info(f"\nTables in database ({len(tables)}):")
-            for table in tables:
-                logger.info(f"  - {table}")
+            # One log record for the whole listing instead of one per table
+            lines = [f"\nTables in database ({len(tables)}):"]
+            lines.extend(f"  - {table}" for table in tables)
+            logger.info("\n".join(lines))
     except Exception as e:
         logger.error(f"Error listing tables: {e}")
 
@@ -48,6 +48,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger("scheduled_watchdog")
 
+# Banner line around log sections and the JSON output
+BANNER = "=" * 60
+
 
 def run_watchdog(send_email: bool = True) -> dict:
     """
@@ -59,10 +62,10 @@ def run_watchdog(send_email: bool = True) -> dict:
     Returns:
         Dictionary with execution results
     """
-    logger.info("=" * 60)
+    logger.info(BANNER)
     logger.info("SUPPLY WATCHDOG - Starting Execution")
     logger.info(f"Timestamp: {datetime.now().isoformat()}")
-    logger.info("=" * 60)
+    logger.info(BANNER)
     
     try:
         # Get orchestrator and run workflow
@@ -146,10 +149,17 @@ def start_scheduler(
         replace_existing=True
     )
     
-    logger.info("=" * 60)
+    # Warm the DB pool and schema index once so scheduled runs start hot;
+    # a failure here only makes the first run slower, so keep scheduling
+    try:
+        get_orchestrator().warm_up()
+    except Exception as e:
+        logger.warning(f"Warm-up failed, continuing without it: {str(e)}")
+    
+    logger.info(BANNER)
     logger.info("SUPPLY WATCHDOG SCHEDULER STARTED")
     logger.info("Press Ctrl+C to stop")
-    logger.info("=" * 60)
+    logger.info(BANNER)
     
     try:
         scheduler.start()
@@ -205,10 +215,10 @@ def main():
         # Print JSON output
         if result.get("success") and result.get("output"):
             import json
-            print("\n" + "=" * 60)
+            print("\n" + BANNER)
             print("JSON OUTPUT:")
-            print("=" * 60)
-            print(json.dumps(result["output"], indent=2))
+            print(BANNER)
+            print(result.get("json_string") or json.dumps(result["output"], indent=2))
         
         sys.exit(0 if result.get("success") else 1)
     else:
@@ -22,6 +22,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Banner and step separator lines
+BANNER = "=" * 80
+SEPARATOR = "-" * 80
+
 
 def check_openai_api_key():
     """Check if OpenAI API key is set."""
@@ -82,9 +86,7 @@ def initialize_chromadb_openai():
         
         return True
     except Exception as e:
-        logger.error(f"✗ Failed to initialize ChromaDB: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"✗ Failed to initialize ChromaDB: {e}")
         return False
 
 
@@ -109,18 +111,16 @@ def verify_setup():
             scores = result.get("similarity_scores", {})
             
             logger.info(f"✓ Semantic search working")
-            logger.info(f"  Found tables: {tables}")
-            for table in tables:
-                logger.info(f"    - {table}: {scores.get(table, 0):.2%} relevance")
+            lines = [f"  Found tables: {tables}"]
+            lines.extend(f"    - {table}: {scores.get(table, 0):.2%} relevance" for table in tables)
+            logger.info("\n".join(lines))
             
             return True
         else:
             logger.error(f"✗ Semantic search failed: {result.get('error')}")
             return False
     except Exception as e:
-        logger.error(f"✗ Verification failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"✗ Verification failed: {e}")
         return False
 
 
@@ -129,9 +129,9 @@ def test_workflow():
     logger.info("\nTesting Workflow B V2 with OpenAI embeddings...")
     
     try:
-        from src.workflows.workflow_b_v2_openai import ScenarioStrategistWorkflowV2OpenAI
+        from src.workflows.workflow_b_v2_openai import get_scenario_strategist_workflow
         
-        workflow = ScenarioStrategistWorkflowV2OpenAI()
+        workflow = get_scenario_strategist_workflow()
         
         logger.info("Executing test query...")
         result = workflow.execute("Show material requirements")
@@ -148,17 +148,15 @@ def test_workflow():
             logger.error(f"✗ Workflow B V2 failed: {result.get('error')}")
             return False
     except Exception as e:
-        logger.error(f"✗ Workflow test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"✗ Workflow test failed: {e}")
         return False
 
 
 def show_usage_examples():
     """Show usage examples."""
-    logger.info("\n" + "=" * 80)
+    logger.info("\n" + BANNER)
     logger.info("USAGE EXAMPLES - Workflow B V2 with OpenAI Embeddings")
-    logger.info("=" * 80)
+    logger.info(BANNER)
     
     examples = """
 1. Basic Query:
@@ -196,9 +194,9 @@ For more examples, see CHROMADB_IMPLEMENTATION_GUIDE.md
 
 def main():
     """Run setup."""
-    logger.info("=" * 80)
+    logger.info(BANNER)
     logger.info("CHROMADB SETUP WITH OPENAI EMBEDDINGS")
-    logger.info("=" * 80)
+    logger.info(BANNER)
     
     steps = [
         ("Check OpenAI API Key", check_openai_api_key),
@@ -211,24 +209,22 @@ def main():
     results = {}
     for step_name, step_func in steps:
         logger.info(f"\n[{len(results) + 1}/{len(steps)}] {step_name}")
-        logger.info("-" * 80)
+        logger.info(SEPARATOR)
         
         try:
             results[step_name] = step_func()
         except Exception as e:
-            logger.error(f"✗ {step_name} failed: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"✗ {step_name} failed: {e}")
             results[step_name] = False
     
     # Summary
-    logger.info("\n" + "=" * 80)
+    logger.info("\n" + BANNER)
     logger.info("SETUP SUMMARY")
-    logger.info("=" * 80)
+    logger.info(BANNER)
     
-    for step_name, passed in results.items():
-        status = "✓" if passed else "✗"
-        logger.info(f"{status} {step_name}")
+    logger.info("\n".join(
+        f"{'✓' if passed else '✗'} {step_name}" for step_name, passed in results.items()
+    ))
     
     all_passed = all(results.values())
     
@@ -38,9 +38,12 @@ class BaseAgent(ABC):
     
     def log_execution(self, input_data: Dict[str, Any], output_data: Dict[str, Any]):
         """Log agent execution."""
-        self.logger.info(f"{self.name} executed")
-        self.logger.debug(f"Input: {input_data}")
-        self.logger.debug(f"Output: {output_data}")
+        self.logger.info("%s executed", self.name)
+        # Agent payloads can hold full query results; only format them when
+        # debug output is actually enabled
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Input: %s", input_data)
+            self.logger.debug("Output: %s", output_data)
     
     def handle_error(self, error: Exception, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -24,6 +24,25 @@ class InventoryAgent(BaseAgent):
     - Provide accurate inventory status with data citations
     """
     
+    # Handler method for each operation taking (filters, schema_result);
+    # check_expiry also needs days_threshold and is dispatched separately
+    OPERATION_HANDLERS = {
+        "find_batch": "_find_batch",
+        "check_outstanding": "_check_outstanding_shipments",
+        "get_purchase_requirements": "_get_purchase_requirements",
+        "get_stock": "_get_stock_levels",
+    }
+    
+    SUPPORTED_OPERATIONS = frozenset(OPERATION_HANDLERS) | {"check_expiry"}
+    
+    DEFAULT_TABLE = "available_inventory_report"
+    
+    # Source table per operation (default: DEFAULT_TABLE)
+    OPERATION_TABLES = {
+        "check_outstanding": "outstanding_site_shipment_status_report",
+        "get_purchase_requirements": "purchase_requirement",
+    }
+    
     def __init__(self, llm=None):
         super().__init__("InventoryAgent", llm)
         self.sql_agent = SQLGenerationAgent(llm)
@@ -56,15 +75,18 @@ class InventoryAgent(BaseAgent):
             days_threshold = input_data.get("days_threshold", 90)
             schema_result = input_data.get("schema_result")
             
+            if operation not in self.SUPPORTED_OPERATIONS:
+                result = {
+                    "success": False,
+                    "error": f"Unknown operation: {operation}"
+                }
+                self.log_execution(input_data, result)
+                return result
+            
             # Get relevant schemas if not provided
             if not schema_result:
                 # Determine which table to use based on operation
-                if operation == "check_outstanding":
-                    table = "outstanding_site_shipment_status_report"
-                elif operation == "get_purchase_requirements":
-                    table = "purchase_requirement"
-                else:
-                    table = "available_inventory_report"
+                table = self.OPERATION_TABLES.get(operation, self.DEFAULT_TABLE)
                 
                 schema_result = self.schema_agent.execute({
                     "query": f"inventory {operation}",
@@ -74,19 +96,9 @@ class InventoryAgent(BaseAgent):
             # Execute operation
             if operation == "check_expiry":
                 result = self._check_expiring_batches(filters, days_threshold, schema_result)
-            elif operation == "find_batch":
-                result = self._find_batch(filters, schema_result)
-            elif operation == "check_outstanding":
-                result = self._check_outstanding_shipments(filters, schema_result)
-            elif operation == "get_purchase_requirements":
-                result = self._get_purchase_requirements(filters, schema_result)
-            elif operation == "get_stock":
-                result = self._get_stock_levels(filters, schema_result)
             else:
-                result = {
-                    "success": False,
-                    "error": f"Unknown operation: {operation}"
-                }
+                handler = getattr(self, self.OPERATION_HANDLERS[operation])
+                result = handler(filters, schema_result)
             
             self.log_execution(input_data, result)
             return result
@@ -250,7 +262,7 @@ class InventoryAgent(BaseAgent):
         
         # Create citations
         citations = [{
-            "table": "available_inventory_report",
+            "table": self.DEFAULT_TABLE,
             "columns": ["trial_name", "location", "lot", "expiry_date", "received_packages"],
             "query_date": datetime.now().isoformat(),
             "row_count": len(batches),
@@ -324,7 +336,7 @@ class InventoryAgent(BaseAgent):
                     pass
         
         citations = [{
-            "table": "available_inventory_report",
+            "table": self.DEFAULT_TABLE,
             "columns": ["lot", "trial_name", "location", "expiry_date", "received_packages"],
             "query_date": datetime.now().isoformat(),
             "batch_id": batch_id if batch_id else "all"
@@ -377,7 +389,7 @@ class InventoryAgent(BaseAgent):
         total_shipped = sum(item.get("shipped_packages", 0) for item in inventory)
         
         citations = [{
-            "table": "available_inventory_report",
+            "table": self.DEFAULT_TABLE,
             "columns": ["trial_name", "location", "received_packages", "shipped_packages"],
             "query_date": datetime.now().isoformat(),
             "row_count": len(inventory)
@@ -2,11 +2,74 @@
 Router Agent - Entry point and workflow classifier.
 """
 import re
+from functools import lru_cache
 from typing import Dict, Any, List
 from .base_agent import BaseAgent
 from src.config.prompts import ROUTER_AGENT_PROMPT
 
 
+# Workflow B query-type keywords (matched as substrings of the lowercased query)
+QUERY_TYPE_KEYWORDS = {
+    "outstanding": ["outstanding", "pending"],
+    "extension": ["extend", "extension", "shelf-life", "expiry"],
+    "purchase": ["purchase", "requirement", "procurement", "order", "supplier"],
+    "inventory": ["stock", "inventory", "quantity", "available"],
+    "demand": ["demand", "enrollment", "forecast", "predict"],
+    "regulatory": ["approval", "regulatory", "compliance", "approved"],
+    "logistics": ["shipping", "timeline", "transport"],  # No "delivery" to avoid conflict with outstanding
+}
+
+_KEYWORD_QUERY_TYPE = {
+    keyword: query_type
+    for query_type, keywords in QUERY_TYPE_KEYWORDS.items()
+    for keyword in keywords
+}
+
+# One pass over the query finds every keyword occurrence: the lookahead
+# matches at each position, and longest-first ordering keeps prefixes
+# (e.g. "extend" vs "extension") from shadowing each other
+_QUERY_TYPE_RE = re.compile(
+    "(?=(" + "|".join(
+        re.escape(keyword) for keyword in sorted(_KEYWORD_QUERY_TYPE, key=len, reverse=True)
+    ) + "))"
+)
+
+
+# Workflow B routing rules in priority order: (query type, intent, agents
+# required after SchemaRetrievalAgent)
+WORKFLOW_B_ROUTES = (
+    # Outstanding shipments - InventoryAgent queries the
+    # outstanding_site_shipment_status_report table directly
+    ("outstanding", "Outstanding shipments inquiry", ("InventoryAgent", "SynthesisAgent")),
+    # Shelf-life extension (complex - needs all checks)
+    ("extension", "Shelf-life extension feasibility assessment",
+     ("InventoryAgent", "RegulatoryAgent", "LogisticsAgent", "SynthesisAgent")),
+    # Purchase/procurement - InventoryAgent queries the purchase_requirement table
+    ("purchase", "Purchase requirement inquiry", ("InventoryAgent", "SynthesisAgent")),
+    ("inventory", "Inventory level inquiry", ("InventoryAgent", "SynthesisAgent")),
+    ("demand", "Demand forecasting inquiry", ("DemandForecastingAgent", "SynthesisAgent")),
+    ("regulatory", "Regulatory compliance inquiry", ("RegulatoryAgent", "SynthesisAgent")),
+    # Logistics (but not outstanding shipments)
+    ("logistics", "Logistics and shipping inquiry", ("LogisticsAgent", "SynthesisAgent")),
+)
+
+# General query - use inventory as default
+DEFAULT_WORKFLOW_B_ROUTE = ("General supply chain inquiry", ("InventoryAgent", "SynthesisAgent"))
+
+
+def detect_query_types(query: str) -> set:
+    """
+    Find which Workflow B query types a lowercased query mentions.
+    
+    Args:
+        query: User query (lowercase)
+        
+    Returns:
+        Set of query type names from QUERY_TYPE_KEYWORDS
+    """
+    return {_KEYWORD_QUERY_TYPE[match.group(1)] for match in _QUERY_TYPE_RE.finditer(query)}
+
+
 class RouterAgent(BaseAgent):
     """
     Router Agent classifies requests and routes to appropriate agents.
@@ -31,6 +94,10 @@ class RouterAgent(BaseAgent):
             "can we", "should we", "what is", "show me", "has", 
             "extend", "batch", "material", "country", "feasibility"
         ]
+        
+        # Routing depends only on the lowercased query, so repeated queries
+        # reuse the earlier result
+        self._route_cached = lru_cache(maxsize=512)(self._route)
     
     def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -53,16 +120,10 @@ class RouterAgent(BaseAgent):
         """
         try:
             query = input_data.get("query", "").lower()
-            context = input_data.get("context", {})
-            
-            # Classify workflow
-            workflow = self._classify_workflow(query)
             
-            # Determine intent and required agents
-            if workflow == "A":
-                result = self._route_workflow_a(query, context)
-            else:
-                result = self._route_workflow_b(query, context)
+            # Copy so callers can't mutate the cached routing result
+            result = dict(self._route_cached(query))
+            result["required_agents"] = list(result["required_agents"])
             
             self.log_execution(input_data, result)
             return result
@@ -70,6 +131,24 @@ class RouterAgent(BaseAgent):
         except Exception as e:
             return self.handle_error(e, input_data)
     
+    def _route(self, query: str) -> Dict[str, Any]:
+        """
+        Classify a lowercased query and build its routing result.
+        
+        Args:
+            query: User query (lowercase)
+            
+        Returns:
+            Routing result dictionary
+        """
+        # Classify workflow
+        workflow = self._classify_workflow(query)
+        
+        # Determine intent and required agents (context does not affect routing)
+        if workflow == "A":
+            return self._route_workflow_a(query, {})
+        return self._route_workflow_b(query, {})
+    
     def _classify_workflow(self, query: str) -> str:
         """
         Classify query as Workflow A or B.
@@ -122,83 +201,13 @@ class RouterAgent(BaseAgent):
         
         Determines which agents are needed based on query type.
         """
-        required_agents = ["SchemaRetrievalAgent"]
-        intent = "Conversational query"
-        
-        # Detect query type - check for outstanding FIRST (highest priority)
-        is_outstanding_query = any(word in query for word in ["outstanding", "pending"])
-        is_extension_query = any(word in query for word in ["extend", "extension", "shelf-life", "expiry"])
-        is_purchase_query = any(word in query for word in ["purchase", "requirement", "procurement", "order", "supplier"])
-        is_inventory_query = any(word in query for word in ["stock", "inventory", "quantity", "available"])
-        is_demand_query = any(word in query for word in ["demand", "enrollment", "forecast", "predict"])
-        is_regulatory_query = any(word in query for word in ["approval", "regulatory", "compliance", "approved"])
-        is_logistics_query = any(word in query for word in ["shipping", "timeline", "transport"])  # Removed "delivery" to avoid conflict with outstanding
-        
-        # Outstanding shipments query - query the outstanding_site_shipment_status_report table directly
-        if is_outstanding_query:
-            intent = "Outstanding shipments inquiry"
-            required_agents.extend([
-                "InventoryAgent",  # Use InventoryAgent to query the report table
-                "SynthesisAgent"
-            ])
-        
-        # Shelf-life extension query (complex - needs all checks)
-        elif is_extension_query:
-            intent = "Shelf-life extension feasibility assessment"
-            required_agents.extend([
-                "InventoryAgent",
-                "RegulatoryAgent",
-                "LogisticsAgent",
-                "SynthesisAgent"
-            ])
-        
-        # Purchase/Procurement query - use InventoryAgent to query purchase_requirement table
-        elif is_purchase_query:
-            intent = "Purchase requirement inquiry"
-            required_agents.extend([
-                "InventoryAgent",  # Will query purchase_requirement table via SchemaRetrievalAgent
-                "SynthesisAgent"
-            ])
-        
-        # Simple inventory query
-        elif is_inventory_query:
-            intent = "Inventory level inquiry"
-            required_agents.extend([
-                "InventoryAgent",
-                "SynthesisAgent"
-            ])
-        
-        # Demand/enrollment query
-        elif is_demand_query:
-            intent = "Demand forecasting inquiry"
-            required_agents.extend([
-                "DemandForecastingAgent",
-                "SynthesisAgent"
-            ])
-        
-        # Regulatory query
-        elif is_regulatory_query:
-            intent = "Regulatory compliance inquiry"
-            required_agents.extend([
-                "RegulatoryAgent",
-                "SynthesisAgent"
-            ])
-        
-        # Logistics query (but not outstanding shipments)
-        elif is_logistics_query:
-            intent = "Logistics and shipping inquiry"
-            required_agents.extend([
-                "LogisticsAgent",
-                "SynthesisAgent"
-            ])
-        
-        # General query - use inventory as default
-        else:
-            intent = "General supply chain inquiry"
-            required_agents.extend([
-                "InventoryAgent",
-                "SynthesisAgent"
-            ])
+        # First rule whose query type appears wins (outstanding has highest priority)
+        query_types = detect_query_types(query)
+        intent, agents = next(
+            ((intent, agents) for query_type, intent, agents in WORKFLOW_B_ROUTES if query_type in query_types),
+            DEFAULT_WORKFLOW_B_ROUTE
+        )
+        required_agents = ["SchemaRetrievalAgent", *agents]
         
         return {
             "workflow": "B",
@@ -254,8 +263,9 @@ class RouterAgent(BaseAgent):
             "Indonesia", "New Zealand", "South Africa", "Egypt", "Turkey", "Israel",
             "Saudi Arabia", "United Arab Emirates", "Argentina", "Chile", "Colombia", "Peru"
         ]
+        query_lower = query.lower()
         for country in common_countries:
-            if country.lower() in query.lower():
+            if country.lower() in query_lower:
                 entities.setdefault("countries", []).append(country)
         
         return entities
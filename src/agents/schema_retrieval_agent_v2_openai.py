@@ -44,7 +44,8 @@ class SchemaRetrievalAgentV2OpenAI(BaseAgent):
                 "query": str,  # User query
                 "workflow": str,  # "A" or "B" (optional)
                 "specific_tables": List[str],  # Specific tables (optional)
-                "n_results": int  # Number of results (default 5)
+                "n_results": int,  # Number of results (default 5)
+                "query_embedding": List[float]  # Pre-computed query embedding (optional)
             }
             
         Returns:
@@ -62,16 +63,17 @@ class SchemaRetrievalAgentV2OpenAI(BaseAgent):
             workflow = input_data.get("workflow")
             specific_tables = input_data.get("specific_tables", [])
             n_results = input_data.get("n_results", self.max_tables)
+            query_embedding = input_data.get("query_embedding")
             
             # Determine search strategy
             if specific_tables:
                 schemas, search_method = self._get_specific_schemas(specific_tables)
             elif workflow:
                 schemas, search_method = self._semantic_search_with_workflow(
-                    query, workflow, n_results
+                    query, workflow, n_results, query_embedding
                 )
             else:
-                schemas, search_method = self._semantic_search(query, n_results)
+                schemas, search_method = self._semantic_search(query, n_results, query_embedding)
             
             # Build similarity scores map
             similarity_scores = {s["table_name"]: s.get("similarity_score", 0) for s in schemas}
@@ -98,16 +100,18 @@ class SchemaRetrievalAgentV2OpenAI(BaseAgent):
     def _semantic_search(
         self,
         query: str,
-        n_results: int
+        n_results: int,
+        query_embedding: Optional[List[float]] = None
     ) -> tuple[List[Dict[str, Any]], str]:
         """Perform semantic search using OpenAI embeddings."""
-        self.logger.info(f"Performing semantic search (OpenAI): {query[:50]}...")
+        self.logger.info("Performing semantic search (OpenAI): %s...", query[:50])
         
         try:
             # Query ChromaDB with OpenAI embeddings
             chroma_results = self.chroma_manager.find_relevant_tables(
                 query=query,
-                n_results=n_results
+                n_results=n_results,
+                query_embedding=query_embedding
             )
             
             # Filter by similarity threshold
@@ -126,7 +130,7 @@ class SchemaRetrievalAgentV2OpenAI(BaseAgent):
                             "workflow": schema.get("workflow", [])
                         })
             
-            self.logger.info(f"Found {len(schemas)} relevant tables")
+            self.logger.info("Found %s relevant tables", len(schemas))
             return schemas, "semantic_openai"
         
         except Exception as e:
@@ -137,16 +141,18 @@ class SchemaRetrievalAgentV2OpenAI(BaseAgent):
         self,
         query: str,
         workflow: str,
-        n_results: int
+        n_results: int,
+        query_embedding: Optional[List[float]] = None
     ) -> tuple[List[Dict[str, Any]], str]:
         """Perform semantic search with workflow filtering."""
-        self.logger.info(f"Semantic search (OpenAI) for workflow {workflow}: {query[:50]}...")
+        self.logger.info("Semantic search (OpenAI) for workflow %s: %s...", workflow, query[:50])
         
         try:
             chroma_results = self.chroma_manager.find_relevant_tables(
                 query=query,
                 n_results=n_results * 2,
-                workflow=workflow
+                workflow=workflow,
+                query_embedding=query_embedding
             )
             
             schemas = []
@@ -167,7 +173,7 @@ class SchemaRetrievalAgentV2OpenAI(BaseAgent):
                 if len(schemas) >= n_results:
                     break
             
-            self.logger.info(f"Found {len(schemas)} relevant tables for workflow {workflow}")
+            self.logger.info("Found %s relevant tables for workflow %s", len(schemas), workflow)
             return schemas, "semantic_openai_workflow"
         
         except Exception as e:
@@ -179,7 +185,7 @@ class SchemaRetrievalAgentV2OpenAI(BaseAgent):
         table_names: List[str]
     ) -> tuple[List[Dict[str, Any]], str]:
         """Get schemas for specific tables."""
-        self.logger.info(f"Retrieving specific schemas: {table_names}")
+        self.logger.info("Retrieving specific schemas: %s", table_names)
         
         schemas = []
         for table_name in table_names[:self.max_tables]:
@@ -214,6 +220,14 @@ class SchemaRetrievalAgentV2OpenAI(BaseAgent):
         
         return "\n".join(formatted_parts)
     
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed several queries in one batched OpenAI call."""
+        return self.chroma_manager.embed_queries(queries)
+    
+    def warm_up(self):
+        """Preload schema embeddings so the first search is not a cold start."""
+        self.chroma_manager.warm_up()
+    
     def get_chroma_stats(self) -> Dict[str, Any]:
         """Get ChromaDB statistics."""
         return self.chroma_manager.get_collection_stats()
@@ -21,6 +21,19 @@ class SQLGenerationAgent(BaseAgent):
     - Parse and interpret SQL error messages
     """
     
+    # Template generator per intent, checked in order; the first generator
+    # whose keywords appear in the intent wins (default: inventory query)
+    TEMPLATE_GENERATORS = (
+        (("outstanding", "pending"), "_generate_outstanding_query"),
+        (("purchase", "requirement", "procurement"), "_generate_purchase_query"),
+        (("expir",), "_generate_expiry_query"),
+        (("batch", "lot"), "_generate_batch_query"),
+        (("enrollment",), "_generate_enrollment_query"),
+        (("re-evaluation", "extension"), "_generate_reevaluation_query"),
+        (("regulatory", "approval"), "_generate_regulatory_query"),
+        (("shipping", "timeline"), "_generate_shipping_query"),
+    )
+    
     def __init__(self, llm=None):
         super().__init__("SQLGenerationAgent", llm)
         self.max_retries = settings.max_sql_retries
@@ -54,7 +67,7 @@ class SQLGenerationAgent(BaseAgent):
             
             # Attempt query generation with self-healing
             for attempt in range(1, self.max_retries + 1):
-                self.logger.info(f"SQL generation attempt {attempt}/{self.max_retries}")
+                self.logger.info("SQL generation attempt %s/%s", attempt, self.max_retries)
                 
                 # Generate query
                 query = self._generate_query(intent, schemas, filters, limit, attempt)
@@ -66,7 +79,7 @@ class SQLGenerationAgent(BaseAgent):
                 validation_report = SQLValidator.get_validation_report(query)
                 if validation_report["was_modified"]:
                     query = validation_report["fixed_query"]
-                    self.logger.info(f"Applied {len(validation_report['fixes_applied'])} fixes to query")
+                    self.logger.info("Applied %s fixes to query", len(validation_report['fixes_applied']))
                 
                 # Execute query
                 result = run_sql_query(query)
@@ -200,7 +213,7 @@ Generate the SQL query:
             if not query.endswith(";"):
                 query += ";"
             
-            self.logger.info(f"LLM generated query: {query[:100]}...")
+            self.logger.info("LLM generated query: %s...", query[:100])
             return query
         except Exception as e:
             self.logger.warning(f"LLM query generation failed: {e}. Falling back to templates.")
@@ -215,41 +228,12 @@ Generate the SQL query:
         """Fallback template-based query generation."""
         intent_lower = intent.lower()
         
-        # Outstanding shipments query
-        if "outstanding" in intent_lower or "pending" in intent_lower:
-            return self._generate_outstanding_query(filters, limit)
-        
-        # Purchase requirement query
-        elif "purchase" in intent_lower or "requirement" in intent_lower or "procurement" in intent_lower:
-            return self._generate_purchase_query(filters, limit)
-        
-        # Expiry alert query
-        elif "expir" in intent_lower:
-            return self._generate_expiry_query(filters, limit)
-        
-        # Batch lookup query
-        elif "batch" in intent_lower or "lot" in intent_lower:
-            return self._generate_batch_query(filters, limit)
-        
-        # Enrollment query
-        elif "enrollment" in intent_lower:
-            return self._generate_enrollment_query(filters, limit)
-        
-        # Re-evaluation query
-        elif "re-evaluation" in intent_lower or "extension" in intent_lower:
-            return self._generate_reevaluation_query(filters, limit)
-        
-        # Regulatory query
-        elif "regulatory" in intent_lower or "approval" in intent_lower:
-            return self._generate_regulatory_query(filters, limit)
-        
-        # Shipping timeline query
-        elif "shipping" in intent_lower or "timeline" in intent_lower:
-            return self._generate_shipping_query(filters, limit)
+        for keywords, generator in self.TEMPLATE_GENERATORS:
+            if any(keyword in intent_lower for keyword in keywords):
+                return getattr(self, generator)(filters, limit)
         
         # Generic inventory query
-        else:
-            return self._generate_inventory_query(filters, limit)
+        return self._generate_inventory_query(filters, limit)
     
     def _generate_outstanding_query(self, filters: Dict, limit: Optional[int]) -> str:
         """Generate query for outstanding shipments by site."""
@@ -90,7 +90,7 @@ class SQLGenerationAgentV2(BaseAgent):
             
             # Attempt query generation with self-healing
             for attempt in range(1, self.max_retries + 1):
-                self.logger.info(f"SQL generation attempt {attempt}/{self.max_retries}")
+                self.logger.info("SQL generation attempt %s/%s", attempt, self.max_retries)
                 
                 # Try each table in order of relevance
                 for table_name in table_names:
@@ -111,7 +111,7 @@ class SQLGenerationAgentV2(BaseAgent):
                     validation_report = SQLValidator.get_validation_report(query)
                     if validation_report["was_modified"]:
                         query = validation_report["fixed_query"]
-                        self.logger.info(f"Applied {len(validation_report['fixes_applied'])} fixes to query")
+                        self.logger.info("Applied %s fixes to query", len(validation_report['fixes_applied']))
                     
                     # Execute query
                     result = run_sql_query(query)
@@ -126,7 +126,7 @@ class SQLGenerationAgentV2(BaseAgent):
                         
                         if is_first_table:
                             # First table - accept regardless of row count
-                            self.logger.info(f"Using first table (highest relevance): {table_name} with {row_count} rows")
+                            self.logger.info("Using first table (highest relevance): %s with %s rows", table_name, row_count)
                             return {
                                 "success": True,
                                 "query": query,
@@ -140,7 +140,7 @@ class SQLGenerationAgentV2(BaseAgent):
                             }
                         elif row_count > 0:
                             # Subsequent tables - only accept if they have results
-                            self.logger.info(f"Using fallback table: {table_name} with {row_count} rows")
+                            self.logger.info("Using fallback table: %s with %s rows", table_name, row_count)
                             return {
                                 "success": True,
                                 "query": query,
@@ -154,7 +154,7 @@ class SQLGenerationAgentV2(BaseAgent):
                             }
                         else:
                             # No results from this table, try next one
-                            self.logger.info(f"Table {table_name} returned no results, trying next table...")
+                            self.logger.info("Table %s returned no results, trying next table...", table_name)
                             continue
                     
                     # Query failed - analyze error
@@ -301,7 +301,7 @@ Generate the SQL query:
             if not query.endswith(";"):
                 query += ";"
             
-            self.logger.info(f"LLM generated query for {table_name}: {query[:100]}...")
+            self.logger.info("LLM generated query for %s: %s...", table_name, query[:100])
             return query
         except Exception as e:
             self.logger.warning(f"LLM query generation failed: {e}. Falling back to generic.")
@@ -341,9 +341,11 @@ Generate the SQL query:
         # Add WHERE clause if filters provided
         where_conditions = []
         for key, value in filters.items():
+            key_lower = key.lower()
             # Try to find matching column
             for col in key_columns:
-                if key.lower() in col["name"].lower() or col["name"].lower() in key.lower():
+                col_lower = col["name"].lower()
+                if key_lower in col_lower or col_lower in key_lower:
                     where_conditions.append(f'"{col["name"]}" = \'{value}\'')
                     break
         
@@ -364,7 +366,7 @@ Generate the SQL query:
         
         query += ";"
         
-        self.logger.info(f"Generated generic query for {table_name}: {query[:100]}...")
+        self.logger.info("Generated generic query for %s: %s...", table_name, query[:100])
         return query
     
     def _analyze_error(
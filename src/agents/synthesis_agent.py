@@ -1,12 +1,17 @@
 """
 Synthesis Agent - Response aggregation and formatting with LLM reasoning.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Union
 from datetime import datetime
 import json
 import logging
 from .base_agent import BaseAgent
-from src.config.prompts import SYNTHESIS_AGENT_PROMPT
+from src.config.prompts import (
+    SYNTHESIS_AGENT_PROMPT,
+    EXTENSION_ASSESSMENT_TEMPLATE,
+    EXTENSION_REASONING_TEMPLATE,
+    GENERAL_QUERY_REASONING_TEMPLATE,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -48,14 +53,15 @@ class SynthesisAgent(BaseAgent):
                 "workflow": str,  # "A" or "B"
                 "agent_outputs": Dict,  # Outputs from other agents
                 "query": str,  # Original user query (for Workflow B)
-                "output_format": str  # "json" or "natural_language"
+                "output_format": str,  # "json" or "natural_language"
+                "stream": bool  # Stream the Workflow B answer (optional)
             }
             
         Returns:
             {
                 "success": bool,
                 "workflow": str,
-                "output": Dict or str,  # Formatted output
+                "output": Dict or str,  # Formatted output (iterator of text chunks when streaming)
                 "citations": List[Dict]  # All data sources
             }
         """
@@ -64,6 +70,7 @@ class SynthesisAgent(BaseAgent):
             agent_outputs = input_data.get("agent_outputs", {})
             query = input_data.get("query", "")
             output_format = input_data.get("output_format", "natural_language")
+            stream = input_data.get("stream", False)
             
             # Synthesize based on workflow
             if workflow == "A" or output_format == "json":
@@ -71,7 +78,7 @@ class SynthesisAgent(BaseAgent):
             elif output_format == "extension_assessment":
                 result = self._synthesize_extension_assessment(agent_outputs, query)
             else:
-                result = self._synthesize_workflow_b(agent_outputs, query)
+                result = self._synthesize_workflow_b(agent_outputs, query, stream)
             
             self.log_execution(input_data, result)
             return result
@@ -183,84 +190,25 @@ class SynthesisAgent(BaseAgent):
         logistical = checks.get("logistical", {})
         
         # Build detailed data summary
-        data_summary = f"""
+        summary_parts = [f"""
 BATCH: {batch_id}
 COUNTRY: {country}
 FINAL ANSWER: {final_answer}
-
-=== TECHNICAL CHECK (re_evaluation table) ===
-Status: {technical.get('status', 'UNKNOWN')}
-Data found: {len(technical.get('data', []))} record(s)
-"""
-        # Add actual technical data
-        for i, record in enumerate(technical.get('data', [])[:3], 1):
-            data_summary += f"\nRecord {i}:\n"
-            for key, value in record.items():
-                data_summary += f"  {key}: {value}\n"
-        
-        data_summary += f"""
-=== REGULATORY CHECK (material_country_requirements table) ===
-Status: {regulatory.get('status', 'UNKNOWN')}
-Data found: {len(regulatory.get('data', []))} record(s)
-"""
-        # Add actual regulatory data
-        for i, record in enumerate(regulatory.get('data', [])[:3], 1):
-            data_summary += f"\nRecord {i}:\n"
-            for key, value in record.items():
-                data_summary += f"  {key}: {value}\n"
-        
-        data_summary += f"""
-=== LOGISTICAL CHECK (ip_shipping_timelines_report table) ===
-Status: {logistical.get('status', 'UNKNOWN')}
-Data found: {len(logistical.get('data', []))} record(s)
-"""
-        # Add actual logistical data
-        for i, record in enumerate(logistical.get('data', [])[:3], 1):
-            data_summary += f"\nRecord {i}:\n"
-            for key, value in record.items():
-                data_summary += f"  {key}: {value}\n"
+"""]
+        self._append_check_section(summary_parts, "TECHNICAL CHECK (re_evaluation table)", technical)
+        self._append_check_section(summary_parts, "REGULATORY CHECK (material_country_requirements table)", regulatory)
+        self._append_check_section(summary_parts, "LOGISTICAL CHECK (ip_shipping_timelines_report table)", logistical)
+        data_summary = "".join(summary_parts)
         
         # Use LLM to format response with actual data citations
         if self.llm:
             try:
-                reasoning_prompt = f"""You are analyzing a shelf-life extension request for a pharmaceutical batch.
-
-USER QUERY: {query}
-
-{data_summary}
-
-IMPORTANT RULES:
-1. Use ONLY the data provided above - DO NOT hallucinate or make up data
-2. If a check has no data (0 records), report it as INDETERMINATE
-3. Cite specific field values from the records (e.g., "Re-evaluation ID: REV-123, Request Type: Extension")
-4. The final answer is already determined as: {final_answer}
-
-Format your response as:
-
-[DIRECT ANSWER]
-State whether the extension can proceed: {final_answer}
-
-[DETAILED ANALYSIS with specific data points]
-
-Technical Check: [✓ PASS / ✗ FAIL / ⚠ INDETERMINATE]
-- If data exists, cite specific values: ID, request type, status, dates
-- If no data, state "No re-evaluation records found for this batch"
-- Source: re_evaluation table
-
-Regulatory Check: [✓ PASS / ✗ FAIL / ⚠ INDETERMINATE]  
-- If data exists, cite specific values: country, compound, approval status
-- If no data, state "No regulatory records found for {country}"
-- Source: material_country_requirements table
-
-Logistical Check: [✓ PASS / ✗ FAIL / ⚠ INDETERMINATE]
-- If data exists, cite specific values: shipping timeline, country
-- If no data, state "No shipping timeline data found for {country}"
-- Source: ip_shipping_timelines_report table
-
-RECOMMENDATION: Based on the {final_answer} result, provide actionable guidance.
-
-Data Sources:
-[List the tables checked with record counts]"""
+                reasoning_prompt = EXTENSION_ASSESSMENT_TEMPLATE.format(
+                    query=query,
+                    data_summary=data_summary,
+                    final_answer=final_answer,
+                    country=country
+                )
 
                 response = self.llm.invoke(reasoning_prompt)
                 
@@ -285,6 +233,23 @@ Data Sources:
             "query": query
         }
     
+    @staticmethod
+    def _record_lines(index: int, record: Dict[str, Any]) -> List[str]:
+        """Format one data record as a header line followed by key: value lines."""
+        return [f"\nRecord {index}:", *(f"  {key}: {value}" for key, value in record.items())]
+    
+    @staticmethod
+    def _append_check_section(parts: List[str], title: str, check: Dict[str, Any]):
+        """Append one extension check (status and up to 3 records) to the summary parts."""
+        records = check.get('data', [])
+        parts.append(f"""
+=== {title} ===
+Status: {check.get('status', 'UNKNOWN')}
+Data found: {len(records)} record(s)
+""")
+        for i, record in enumerate(records[:3], 1):
+            parts.append("\n".join(SynthesisAgent._record_lines(i, record)) + "\n")
+    
     def _format_extension_fallback(
         self,
         batch_id: str,
@@ -323,7 +288,8 @@ Source: {logistical.get('source', 'ip_shipping_timelines_report')}
     def _synthesize_workflow_b(
         self,
         agent_outputs: Dict[str, Any],
-        query: str
+        query: str,
+        stream: bool = False
     ) -> Dict[str, Any]:
         """
         Synthesize Workflow B output with LLM reasoning over aggregated data.
@@ -331,22 +297,24 @@ Source: {logistical.get('source', 'ip_shipping_timelines_report')}
         Args:
             agent_outputs: Outputs from various agents
             query: Original user query
+            stream: Return general-query answers as an iterator of text chunks
             
         Returns:
             Dictionary with natural language response
         """
         # Determine query type
-        is_extension_query = "extend" in query.lower() or "extension" in query.lower()
+        query_lower = query.lower()
+        is_extension_query = "extend" in query_lower or "extension" in query_lower
         
         # Collect all data and citations
         all_data = self._aggregate_agent_data(agent_outputs)
-        all_citations = self._collect_all_citations(agent_outputs)
+        all_citations = self._collect_all_citations(agent_outputs, dedupe=True)
         
         # Use LLM to reason over the aggregated data
         if is_extension_query:
             response = self._reason_extension_query(query, all_data, all_citations)
         else:
-            response = self._reason_general_query(query, all_data, all_citations)
+            response = self._reason_general_query(query, all_data, all_citations, stream)
         
         return {
             "success": True,
@@ -354,6 +322,7 @@ Source: {logistical.get('source', 'ip_shipping_timelines_report')}
             "output_format": "natural_language",
             "output": response,
             "citations": all_citations,
+            "cited_tables": self._cited_tables(all_citations),
             "query": query
         }
     
@@ -368,67 +337,109 @@ Source: {logistical.get('source', 'ip_shipping_timelines_report')}
             Formatted text with all data
         """
         data_parts = []
-        
         for agent_name, output in agent_outputs.items():
-            if not isinstance(output, dict):
-                continue
-            
-            if output.get("success"):
-                # Get the actual table(s) queried from citations
-                tables_queried = []
-                if output.get("citations"):
-                    for citation in output["citations"]:
-                        table = citation.get("table")
-                        if table and table not in tables_queried:
-                            tables_queried.append(table)
-                
-                # Use table names in header if available, otherwise use agent name
-                if tables_queried:
-                    header = f"=== {', '.join(tables_queried).upper()} ==="
-                else:
-                    header = f"=== {agent_name.upper()} ==="
-                
-                data_parts.append(f"\n{header}")
-                
-                # Add summary if available
-                if output.get("summary_text"):
-                    data_parts.append(output["summary_text"])
-                
-                # Add structured data
-                if output.get("data"):
-                    data = output["data"]
-                    if isinstance(data, list):
-                        data_parts.append(f"Records found: {len(data)}")
-                        for i, record in enumerate(data[:10], 1):  # Show first 10
-                            data_parts.append(f"\nRecord {i}:")
-                            for key, value in record.items():
-                                data_parts.append(f"  {key}: {value}")
-                    elif isinstance(data, dict):
-                        for key, value in data.items():
-                            data_parts.append(f"{key}: {value}")
-                
-                # Add summary dict if available
-                if output.get("summary") and isinstance(output["summary"], dict):
-                    data_parts.append("\nSummary:")
-                    for key, value in output["summary"].items():
-                        data_parts.append(f"  {key}: {value}")
-            else:
-                # Agent failed - include error info
-                data_parts.append(f"\n=== {agent_name.upper()} ===")
-                data_parts.append(f"Status: FAILED")
-                data_parts.append(f"Error: {output.get('error', 'Unknown error')}")
+            data_parts.extend(self._render_agent_output(agent_name, output))
         
         if not data_parts:
             return "No data retrieved from agents."
         
         return "\n".join(data_parts)
     
-    def _collect_all_citations(self, agent_outputs: Dict[str, Any]) -> List[Dict]:
-        """Collect all citations from all agents."""
+    def _render_agent_output(self, agent_name: str, output: Any) -> List[str]:
+        """
+        Format one agent's output as lines for _aggregate_agent_data.
+        
+        Args:
+            agent_name: Name of the agent
+            output: The agent's output (non-dict outputs are skipped)
+            
+        Returns:
+            List of text lines (empty if there is nothing to show)
+        """
+        if not isinstance(output, dict):
+            return []
+        
+        if not output.get("success"):
+            # Agent failed - include error info
+            return [
+                f"\n=== {agent_name.upper()} ===",
+                "Status: FAILED",
+                f"Error: {output.get('error', 'Unknown error')}"
+            ]
+        
+        # Get the actual table(s) queried from citations
+        tables_queried = self._cited_tables(output.get("citations") or [])
+        
+        # Use table names in header if available, otherwise use agent name
+        if tables_queried:
+            header = f"=== {', '.join(tables_queried).upper()} ==="
+        else:
+            header = f"=== {agent_name.upper()} ==="
+        
+        lines = [f"\n{header}"]
+        
+        # Add summary if available
+        if output.get("summary_text"):
+            lines.append(output["summary_text"])
+        
+        # Add structured data
+        if output.get("data"):
+            data = output["data"]
+            if isinstance(data, list):
+                lines.append(f"Records found: {len(data)}")
+                for i, record in enumerate(data[:10], 1):  # Show first 10
+                    lines.extend(self._record_lines(i, record))
+            elif isinstance(data, dict):
+                for key, value in data.items():
+                    lines.append(f"{key}: {value}")
+        
+        # Add summary dict if available
+        if output.get("summary") and isinstance(output["summary"], dict):
+            lines.append("\nSummary:")
+            for key, value in output["summary"].items():
+                lines.append(f"  {key}: {value}")
+        
+        return lines
+    
+    @staticmethod
+    def _cited_tables(citations: List[Dict]) -> List[str]:
+        """Unique table names from citations, in first-seen order."""
+        return list(dict.fromkeys(
+            citation["table"] for citation in citations if citation.get("table")
+        ))
+    
+    def _collect_all_citations(
+        self,
+        agent_outputs: Dict[str, Any],
+        dedupe: bool = False
+    ) -> List[Dict]:
+        """
+        Collect all citations from all agents.
+        
+        Args:
+            agent_outputs: Outputs from all agents
+            dedupe: Keep only the first of citations that share table,
+                columns, batch_id and row_count (i.e. the same evidence)
+            
+        Returns:
+            List of citations in agent order
+        """
         all_citations = []
         for agent_name, output in agent_outputs.items():
             if isinstance(output, dict) and output.get("citations"):
                 all_citations.extend(output["citations"])
+        
+        if dedupe:
+            unique = {}
+            for citation in all_citations:
+                key = (
+                    citation.get("table"),
+                    tuple(sorted(citation.get("columns") or [])),
+                    citation.get("batch_id"),
+                    citation.get("row_count")
+                )
+                unique.setdefault(key, citation)
+            return list(unique.values())
         return all_citations
     
     def _reason_extension_query(
@@ -451,41 +462,10 @@ Source: {logistical.get('source', 'ip_shipping_timelines_report')}
         if not self.llm:
             return self._format_extension_response(aggregated_data, query)
         
-        reasoning_prompt = f"""You are analyzing a shelf-life extension request for a pharmaceutical batch.
-
-USER QUERY: {query}
-
-AGGREGATED DATA FROM AGENTS:
-{aggregated_data}
-
-Your task:
-1. Analyze the three constraints: Technical, Regulatory, and Logistical
-2. Provide a clear YES/NO/CONDITIONAL answer
-3. Explain your reasoning with specific data points
-4. Cite the sources for each finding
-5. If data is missing or conflicting, state it explicitly
-6. Aggregate any duplicate locations or batches (e.g., if Saint Kitts and Nevis appears twice, sum the quantities)
-
-Response format:
-CAN WE EXTEND [BATCH] FOR [COUNTRY]?
-
-Answer: [YES / NO / CONDITIONAL]
-
-Technical Check: [✓ PASS / ✗ FAIL]
-- Finding: [specific data point]
-- Source: [table name]
-
-Regulatory Check: [✓ PASS / ✗ FAIL]
-- Finding: [specific data point]
-- Source: [table name]
-
-Logistical Check: [✓ PASS / ⚠ CONDITIONAL / ✗ FAIL]
-- Finding: [specific data point with calculation]
-- Source: [table name]
-
-RECOMMENDATION: [Clear action statement]
-
-IMPORTANT: Be precise, cite data, aggregate duplicates, and explain your reasoning clearly."""
+        reasoning_prompt = EXTENSION_REASONING_TEMPLATE.format(
+            query=query,
+            aggregated_data=aggregated_data
+        )
         
         try:
             response = self.llm.invoke(reasoning_prompt)
@@ -499,8 +479,9 @@ IMPORTANT: Be precise, cite data, aggregate duplicates, and explain your reasoni
         self,
         query: str,
         aggregated_data: str,
-        citations: List[Dict]
-    ) -> str:
+        citations: List[Dict],
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
         """
         Use LLM to reason over general query data.
         
@@ -508,50 +489,27 @@ IMPORTANT: Be precise, cite data, aggregate duplicates, and explain your reasoni
             query: Original user query
             aggregated_data: All collected data
             citations: All data sources
+            stream: Yield the response in chunks as the LLM produces them
             
         Returns:
-            Reasoned response
+            Reasoned response (iterator of text chunks when streaming)
         """
         if not self.llm:
             return self._format_general_response(aggregated_data, query)
         
         # Extract table names from citations for context
-        tables_used = []
-        for citation in citations:
-            table = citation.get("table")
-            if table and table not in tables_used:
-                tables_used.append(table)
+        tables_used = self._cited_tables(citations)
         
         tables_context = f"Data sources: {', '.join(tables_used)}" if tables_used else "Data sources: Multiple tables"
         
-        reasoning_prompt = f"""You are a supply chain analyst answering a user query about pharmaceutical inventory and logistics.
-
-USER QUERY: {query}
-
-{tables_context}
-
-AGGREGATED DATA FROM AGENTS:
-{aggregated_data}
-
-Your task:
-1. Answer the user's question directly and clearly using ONLY the data provided
-2. Provide specific data points from the aggregated data
-3. Aggregate any duplicate entries (e.g., if a location appears multiple times, sum quantities)
-4. Cite the sources for each finding
-5. If data is missing or conflicting, state it explicitly
-6. Explain any calculations or reasoning
-7. IMPORTANT: Use data from the tables listed above, not from other sources
-
-Response format:
-[DIRECT ANSWER]
-
-[DETAILED ANALYSIS with specific data points]
-
-Data Sources:
-- [Table name]: [specific finding]
-- [Table name]: [specific finding]
-
-IMPORTANT: Be precise, cite data, aggregate duplicates, and explain your reasoning clearly. Use ONLY the data provided above."""
+        reasoning_prompt = GENERAL_QUERY_REASONING_TEMPLATE.format(
+            query=query,
+            tables_context=tables_context,
+            aggregated_data=aggregated_data
+        )
+        
+        if stream:
+            return self._stream_reasoning(reasoning_prompt, aggregated_data, query)
         
         try:
             response = self.llm.invoke(reasoning_prompt)
@@ -561,6 +519,33 @@ IMPORTANT: Be precise, cite data, aggregate duplicates, and explain your reasoni
             logger.error(f"LLM reasoning failed: {str(e)}")
             return self._format_general_response(aggregated_data, query)
     
+    def _stream_reasoning(
+        self,
+        reasoning_prompt: str,
+        aggregated_data: str,
+        query: str
+    ) -> Iterator[str]:
+        """
+        Stream a general-query response from the LLM chunk by chunk.
+        
+        Falls back to the formatted response if the LLM fails before
+        producing any output; a failure mid-stream ends the answer with a
+        note instead of raising into the caller's renderer.
+        """
+        started = False
+        try:
+            for chunk in self.llm.stream(reasoning_prompt):
+                if isinstance(chunk.content, str) and chunk.content:
+                    started = True
+                    yield chunk.content
+        
+        except Exception as e:
+            logger.error(f"LLM reasoning failed: {str(e)}")
+            if started:
+                yield "\n\n⚠️ The response was cut short by an error. Please try again."
+            else:
+                yield self._format_general_response(aggregated_data, query)
+    
     def _format_extension_response(
         self,
         agent_outputs: Dict[str, Any],
@@ -356,3 +356,110 @@ Predict stock shortfalls for next {weeks} weeks:
 5. Flag shortfalls and estimate stockout dates
 6. Group by country and material
 """
+
+# Shelf-life extension answer from the pre-computed checks (extension workflow)
+EXTENSION_ASSESSMENT_TEMPLATE = """You are analyzing a shelf-life extension request for a pharmaceutical batch.
+
+USER QUERY: {query}
+
+{data_summary}
+
+IMPORTANT RULES:
+1. Use ONLY the data provided above - DO NOT hallucinate or make up data
+2. If a check has no data (0 records), report it as INDETERMINATE
+3. Cite specific field values from the records (e.g., "Re-evaluation ID: REV-123, Request Type: Extension")
+4. The final answer is already determined as: {final_answer}
+
+Format your response as:
+
+[DIRECT ANSWER]
+State whether the extension can proceed: {final_answer}
+
+[DETAILED ANALYSIS with specific data points]
+
+Technical Check: [✓ PASS / ✗ FAIL / ⚠ INDETERMINATE]
+- If data exists, cite specific values: ID, request type, status, dates
+- If no data, state "No re-evaluation records found for this batch"
+- Source: re_evaluation table
+
+Regulatory Check: [✓ PASS / ✗ FAIL / ⚠ INDETERMINATE]  
+- If data exists, cite specific values: country, compound, approval status
+- If no data, state "No regulatory records found for {country}"
+- Source: material_country_requirements table
+
+Logistical Check: [✓ PASS / ✗ FAIL / ⚠ INDETERMINATE]
+- If data exists, cite specific values: shipping timeline, country
+- If no data, state "No shipping timeline data found for {country}"
+- Source: ip_shipping_timelines_report table
+
+RECOMMENDATION: Based on the {final_answer} result, provide actionable guidance.
+
+Data Sources:
+[List the tables checked with record counts]"""
+
+# Shelf-life extension reasoning over aggregated agent outputs
+EXTENSION_REASONING_TEMPLATE = """You are analyzing a shelf-life extension request for a pharmaceutical batch.
+
+USER QUERY: {query}
+
+AGGREGATED DATA FROM AGENTS:
+{aggregated_data}
+
+Your task:
+1. Analyze the three constraints: Technical, Regulatory, and Logistical
+2. Provide a clear YES/NO/CONDITIONAL answer
+3. Explain your reasoning with specific data points
+4. Cite the sources for each finding
+5. If data is missing or conflicting, state it explicitly
+6. Aggregate any duplicate locations or batches (e.g., if Saint Kitts and Nevis appears twice, sum the quantities)
+
+Response format:
+CAN WE EXTEND [BATCH] FOR [COUNTRY]?
+
+Answer: [YES / NO / CONDITIONAL]
+
+Technical Check: [✓ PASS / ✗ FAIL]
+- Finding: [specific data point]
+- Source: [table name]
+
+Regulatory Check: [✓ PASS / ✗ FAIL]
+- Finding: [specific data point]
+- Source: [table name]
+
+Logistical Check: [✓ PASS / ⚠ CONDITIONAL / ✗ FAIL]
+- Finding: [specific data point with calculation]
+- Source: [table name]
+
+RECOMMENDATION: [Clear action statement]
+
+IMPORTANT: Be precise, cite data, aggregate duplicates, and explain your reasoning clearly."""
+
+# General Workflow B query reasoning over aggregated agent outputs
+GENERAL_QUERY_REASONING_TEMPLATE = """You are a supply chain analyst answering a user query about pharmaceutical inventory and logistics.
+
+USER QUERY: {query}
+
+{tables_context}
+
+AGGREGATED DATA FROM AGENTS:
+{aggregated_data}
+
+Your task:
+1. Answer the user's question directly and clearly using ONLY the data provided
+2. Provide specific data points from the aggregated data
+3. Aggregate any duplicate entries (e.g., if a location appears multiple times, sum quantities)
+4. Cite the sources for each finding
+5. If data is missing or conflicting, state it explicitly
+6. Explain any calculations or reasoning
+7. IMPORTANT: Use data from the tables listed above, not from other sources
+
+Response format:
+[DIRECT ANSWER]
+
+[DETAILED ANALYSIS with specific data points]
+
+Data Sources:
+- [Table name]: [specific finding]
+- [Table name]: [specific finding]
+
+IMPORTANT: Be precise, cite data, aggregate duplicates, and explain your reasoning clearly. Use ONLY the data provided above."""
@@ -15,6 +15,20 @@ class Settings(BaseSettings):
         default="postgresql://localhost:5432/clinical_supply_chain",
         description="PostgreSQL connection string"
     )
+    db_pool_min_connections: int = Field(
+        default=2,
+        description="Connections kept open in the database connection pool"
+    )
+    db_pool_max_connections: int = Field(
+        default=20,
+        description="Maximum database connections per process, shared by the "
+                    "psycopg2 pool and the SQLAlchemy engine"
+    )
+    db_engine_pool_size: int = Field(
+        default=2,
+        description="Connections of db_pool_max_connections reserved for the "
+                    "SQLAlchemy engine; the psycopg2 pool gets the rest"
+    )
     
     # LLM Configuration
     llm_provider: Literal["openai", "anthropic"] = Field(
@@ -34,6 +48,14 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", description="Logging level")
     max_sql_retries: int = Field(default=3, description="Maximum SQL retry attempts")
     query_timeout: int = Field(default=30, description="Query timeout in seconds")
+    query_cache_ttl: int = Field(
+        default=0,
+        description="Seconds to reuse results of identical read queries (0 disables)"
+    )
+    workflow_b_replay_file: str = Field(
+        default="",
+        description="JSON file to record Workflow B responses to and replay them from (empty disables)"
+    )
 
     
     # Workflow Settings
@@ -6,7 +6,7 @@ Uses Resend API to send email alerts when Workflow A detects risks.
 import os
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -36,7 +36,7 @@ class EmailService:
         self,
         subject: str,
         html_content: str,
-        json_attachment: Optional[Dict[str, Any]] = None
+        json_attachment: Optional[Union[Dict[str, Any], str]] = None
     ) -> Dict[str, Any]:
         """
         Send an email alert.
@@ -44,7 +44,7 @@ class EmailService:
         Args:
             subject: Email subject
             html_content: HTML body content
-            json_attachment: Optional JSON data to attach
+            json_attachment: Optional JSON data (or pre-serialized JSON string) to attach
             
         Returns:
             Dictionary with send status
@@ -69,7 +69,10 @@ class EmailService:
             
             # Add JSON attachment if provided
             if json_attachment:
-                json_str = json.dumps(json_attachment, indent=2)
+                json_str = (
+                    json_attachment if isinstance(json_attachment, str)
+                    else json.dumps(json_attachment, indent=2)
+                )
                 email_params["attachments"] = [{
                     "filename": f"supply_watchdog_{datetime.now().strftime('%Y%m%d')}.json",
                     "content": json_str
@@ -114,7 +117,8 @@ class EmailService:
         return self.send_alert(
             subject=subject,
             html_content=html_content,
-            json_attachment=output
+            # Reuse the JSON Workflow A already serialized
+            json_attachment=workflow_result.get("json_string") or output
         )
     
     def _build_subject(self, summary: Dict[str, Any]) -> str:
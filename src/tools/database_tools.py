@@ -1,11 +1,18 @@
 """
 Database tools for executing SQL queries and managing connections.
 """
+import atexit
+import json
 import logging
-from typing import Dict, List, Any, Optional
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterator, List, Any, Optional, Tuple, Union
 from datetime import datetime
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
@@ -14,34 +21,147 @@ from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Only plain reads may be served from the query cache; a statement that
+# mentions a write keyword (e.g. a data-modifying CTE or SELECT ... FOR
+# UPDATE) always goes to the database
+_CACHEABLE_PREFIXES = ("SELECT", "WITH")
+_WRITE_KEYWORDS_RE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE)\b", re.IGNORECASE)
+
 
 class DatabaseTools:
     """Tools for database operations."""
     
+    # Seconds a cached table listing stays valid
+    TABLE_LIST_TTL = 60
+    
+    # Seconds before a SQLAlchemy pooled connection is replaced
+    POOL_RECYCLE_SECONDS = 1800
+    
+    # Maximum entries in the read-query result cache (see settings.query_cache_ttl)
+    QUERY_CACHE_MAX_ENTRIES = 256
+    
+    # Checkouts tried before giving up when pooled connections turn out dead
+    CONNECTION_CHECKOUT_ATTEMPTS = 2
+    
+    # Pooled connections idle longer than this are pinged before reuse
+    CONNECTION_IDLE_PING_SECONDS = 60
+    
     def __init__(self, database_url: Optional[str] = None):
         """Initialize database connection."""
         self.database_url = database_url or settings.database_url
-        self.engine = create_engine(self.database_url)
+        # The engine gets its own slice of db_pool_max_connections (see
+        # _get_pool), so both pools together stay within the limit;
+        # pre-ping and recycling drop connections the server closed while
+        # they sat idle
+        self.engine = create_engine(
+            self.database_url,
+            pool_size=settings.db_engine_pool_size,
+            max_overflow=0,
+            pool_pre_ping=True,
+            pool_recycle=self.POOL_RECYCLE_SECONDS
+        )
         self.SessionLocal = sessionmaker(bind=self.engine)
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._pool_slots: Optional[threading.BoundedSemaphore] = None
+        # id(connection) -> monotonic time it was last returned to the pool
+        self._returned_at: Dict[int, float] = {}
+        self._pool_lock = threading.Lock()
+        self._tables_cache: Optional[tuple[float, List[str], FrozenSet[str]]] = None
+        self._query_cache: OrderedDict[tuple, tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+    
+    def _get_pool(self) -> Tuple[ThreadedConnectionPool, threading.BoundedSemaphore]:
+        """
+        Create the connection pool on first use.
+        
+        Returns:
+            The pool and a semaphore holding one slot per pooled connection;
+            take a slot before getconn so callers wait instead of hitting
+            PoolError when every connection is checked out
+        """
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # Connections not reserved for the SQLAlchemy engine
+                    max_connections = max(1, settings.db_pool_max_connections - settings.db_engine_pool_size)
+                    self._pool_slots = threading.BoundedSemaphore(max_connections)
+                    self._pool = ThreadedConnectionPool(
+                        minconn=min(settings.db_pool_min_connections, max_connections),
+                        maxconn=max_connections,
+                        dsn=self.database_url
+                    )
+        return self._pool, self._pool_slots
+    
+    def close(self):
+        """Close all pooled connections."""
+        with self._pool_lock:
+            if self._pool is not None and not self._pool.closed:
+                self._pool.closeall()
+            self._pool = None
+            self._pool_slots = None
+            self._returned_at.clear()
+    
+    def _checkout(self, pool: ThreadedConnectionPool):
+        """
+        Borrow a live connection from the pool.
+        
+        Closed connections are discarded. Only connections that are new or
+        sat idle past CONNECTION_IDLE_PING_SECONDS (when the server may have
+        dropped them) are pinged, so recently used ones cost no extra
+        round-trip; a dead one is discarded and the checkout retried.
+        """
+        for attempt in range(1, self.CONNECTION_CHECKOUT_ATTEMPTS + 1):
+            conn = pool.getconn()
+            returned_at = self._returned_at.pop(id(conn), None)
+            try:
+                if conn.closed:
+                    raise psycopg2.InterfaceError("connection already closed")
+                if returned_at is None or time.monotonic() - returned_at > self.CONNECTION_IDLE_PING_SECONDS:
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT 1")
+                    conn.rollback()
+                return conn
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                pool.putconn(conn, close=True)
+                if attempt == self.CONNECTION_CHECKOUT_ATTEMPTS:
+                    raise
+                logger.warning("Discarding dead pooled connection: %s", e)
     
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = psycopg2.connect(self.database_url)
+        """
+        Context manager for database connections.
+        
+        Connections are borrowed from a thread-safe pool and returned on exit,
+        so repeated queries skip the connect/authentication round-trips.
+        When the pool is exhausted, callers block until a connection is
+        returned.
+        """
+        pool, slots = self._get_pool()
+        slots.acquire()
         try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
+            conn = self._checkout(pool)
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                if not conn.closed:
+                    conn.rollback()
+                raise e
+            finally:
+                # Discard connections that were closed by the server
+                if not conn.closed:
+                    self._returned_at[id(conn)] = time.monotonic()
+                pool.putconn(conn, close=bool(conn.closed))
         finally:
-            conn.close()
+            slots.release()
     
     def execute_query(
         self,
         query: str,
         params: Optional[Dict[str, Any]] = None,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        max_rows: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Execute SQL query and return results.
@@ -50,47 +170,247 @@ class DatabaseTools:
             query: SQL query string
             params: Query parameters for parameterized queries
             timeout: Query timeout in seconds
+            max_rows: Fetch at most this many rows of a SELECT through a
+                server-side cursor, so the rest are never sent; the result
+                gets "truncated": True when rows were left behind
             
         Returns:
             Dictionary with results or error information
         """
         timeout = timeout or settings.query_timeout
         
+        cache_key = (query, repr(params), max_rows)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             with self.get_connection() as conn:
-                # Set statement timeout
-                with conn.cursor() as cur:
-                    cur.execute(f"SET statement_timeout = {timeout * 1000}")
-                
-                # Execute query
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    if params:
-                        cur.execute(query, params)
+                self._set_statement_timeout(conn, timeout)
+                if max_rows is None:
+                    result = self._run_statement(conn, query, params)
+                else:
+                    result = self._run_limited_statement(conn, query, params, max_rows)
+        
+        except Exception as e:
+            return self._error_result(query, e)
+        
+        self._cache_result(cache_key, result)
+        return result
+    
+    def _get_cached_result(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of a fresh cached read result, or None."""
+        ttl = settings.query_cache_ttl
+        if ttl <= 0:
+            return None
+        
+        with self._query_cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= ttl:
+                del self._query_cache[key]
+                return None
+            self._query_cache.move_to_end(key)
+            result = entry[1]
+        
+        # Callers modify rows in place (e.g. adding severity); hand out copies
+        return self._copy_result(result)
+    
+    def _cache_result(self, key: tuple, result: Dict[str, Any]):
+        """Cache a successful read-only result when query caching is enabled."""
+        if settings.query_cache_ttl <= 0 or "data" not in result:
+            return
+        if not self._is_cacheable(key[0]):
+            return
+        
+        with self._query_cache_lock:
+            self._query_cache[key] = (time.monotonic(), self._copy_result(result))
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > self.QUERY_CACHE_MAX_ENTRIES:
+                self._query_cache.popitem(last=False)
+    
+    @staticmethod
+    def _is_cacheable(query: str) -> bool:
+        """Check whether a query is a plain read whose result may be reused."""
+        stripped = query.lstrip()
+        return (
+            stripped[:6].upper().startswith(_CACHEABLE_PREFIXES)
+            and not _WRITE_KEYWORDS_RE.search(stripped)
+        )
+    
+    @staticmethod
+    def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a read result down to its rows, so no row dict is shared."""
+        return {**result, "data": [dict(row) for row in result["data"]]}
+    
+    def clear_query_cache(self):
+        """Drop all cached read results (e.g. after loading new data)."""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+    
+    def iter_query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        fetch_size: int = 100,
+        timeout: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the rows of a SELECT as they arrive, without building a list.
+        
+        Rows come from a named (server-side) cursor fetch_size rows at a
+        time, so memory stays flat however large the result is. The pooled
+        connection is held until the iterator is exhausted or closed.
+        Unlike execute_query, database errors are raised, not returned.
+        
+        Args:
+            query: SQL query string (SELECT only)
+            params: Query parameters
+            fetch_size: Rows fetched from the server per round-trip
+            timeout: Query timeout in seconds
+            
+        Yields:
+            One dict per row
+        """
+        timeout = timeout or settings.query_timeout
+        
+        with self.get_connection() as conn:
+            self._set_statement_timeout(conn, timeout)
+            with conn.cursor(name="stream_rows", cursor_factory=RealDictCursor) as cur:
+                cur.itersize = fetch_size
+                if params:
+                    cur.execute(query, params)
+                else:
+                    cur.execute(query)
+                yield from cur
+    
+    def execute_queries(
+        self,
+        queries: List[Union[str, Tuple[str, Any]]],
+        timeout: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute several SQL queries on one borrowed connection.
+        
+        Saves a pool checkout and the statement-timeout round-trip per
+        query compared to calling execute_query in a loop. Each query runs
+        under its own savepoint, so a failing query is rolled back alone:
+        the others, including earlier writes, still run and are committed
+        together at the end.
+        
+        Args:
+            queries: SQL strings, or (query, params) tuples
+            timeout: Query timeout in seconds, applied to each query
+            
+        Returns:
+            List of result dictionaries (as from execute_query), in order
+        """
+        timeout = timeout or settings.query_timeout
+        statements = [(q, None) if isinstance(q, str) else q for q in queries]
+        results = []
+        
+        try:
+            with self.get_connection() as conn:
+                self._set_statement_timeout(conn, timeout)
+                for query, params in statements:
+                    with conn.cursor() as cur:
+                        cur.execute("SAVEPOINT batch_statement")
+                    try:
+                        results.append(self._run_statement(conn, query, params))
+                    except psycopg2.Error as e:
+                        results.append(self._error_result(query, e))
+                        with conn.cursor() as cur:
+                            cur.execute("ROLLBACK TO SAVEPOINT batch_statement")
                     else:
-                        cur.execute(query)
-                    
-                    # Fetch results
-                    if cur.description:  # SELECT query
-                        results = cur.fetchall()
-                        columns = [desc[0] for desc in cur.description]
-                        
-                        return {
-                            "success": True,
-                            "data": [dict(row) for row in results],
-                            "columns": columns,
-                            "row_count": len(results),
-                            "query": query,
-                            "executed_at": datetime.now().isoformat()
-                        }
-                    else:  # INSERT/UPDATE/DELETE
-                        return {
-                            "success": True,
-                            "rows_affected": cur.rowcount,
-                            "query": query,
-                            "executed_at": datetime.now().isoformat()
-                        }
+                        with conn.cursor() as cur:
+                            cur.execute("RELEASE SAVEPOINT batch_statement")
         
-        except psycopg2.Error as e:
+        except Exception as e:
+            # Connection-level failure or failed commit: nothing was
+            # committed, so earlier writes are failures too, and the
+            # remaining queries never ran
+            results = [
+                self._error_result(query, e) if "rows_affected" in result else result
+                for (query, _), result in zip(statements, results)
+            ]
+            results.extend(
+                self._error_result(query, e) for query, _ in statements[len(results):]
+            )
+        
+        return results
+    
+    @staticmethod
+    def _set_statement_timeout(conn, timeout: int):
+        """Set the statement timeout (in seconds) for the current transaction."""
+        with conn.cursor() as cur:
+            cur.execute(f"SET statement_timeout = {timeout * 1000}")
+    
+    @staticmethod
+    def _run_statement(conn, query: str, params: Optional[Any] = None) -> Dict[str, Any]:
+        """Execute one query on an open connection and build its result."""
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            if params:
+                cur.execute(query, params)
+            else:
+                cur.execute(query)
+            
+            # Fetch results
+            if cur.description:  # SELECT query
+                # RealDictCursor rows are already dicts; no per-row copy needed
+                results = cur.fetchall()
+                columns = [desc[0] for desc in cur.description]
+                
+                return {
+                    "success": True,
+                    "data": results,
+                    "columns": columns,
+                    "row_count": len(results),
+                    "query": query,
+                    "executed_at": datetime.now().isoformat()
+                }
+            else:  # INSERT/UPDATE/DELETE
+                return {
+                    "success": True,
+                    "rows_affected": cur.rowcount,
+                    "query": query,
+                    "executed_at": datetime.now().isoformat()
+                }
+    
+    @staticmethod
+    def _run_limited_statement(
+        conn,
+        query: str,
+        params: Optional[Any],
+        max_rows: int
+    ) -> Dict[str, Any]:
+        """Run a SELECT through a named (server-side) cursor and fetch at most max_rows."""
+        with conn.cursor(name="limited_fetch", cursor_factory=RealDictCursor) as cur:
+            if params:
+                cur.execute(query, params)
+            else:
+                cur.execute(query)
+            
+            # One extra row tells us whether the result was cut off
+            results = cur.fetchmany(max_rows + 1)
+            truncated = len(results) > max_rows
+            del results[max_rows:]
+            columns = [desc[0] for desc in cur.description] if cur.description else []
+        
+        return {
+            "success": True,
+            "data": results,
+            "columns": columns,
+            "row_count": len(results),
+            "truncated": truncated,
+            "query": query,
+            "executed_at": datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def _error_result(query: str, e: Exception) -> Dict[str, Any]:
+        """Log a failed query and build its error result."""
+        if isinstance(e, psycopg2.Error):
             logger.error(f"Database error: {e}")
             return {
                 "success": False,
@@ -101,15 +421,14 @@ class DatabaseTools:
                 "executed_at": datetime.now().isoformat()
             }
         
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "error_type": type(e).__name__,
-                "query": query,
-                "executed_at": datetime.now().isoformat()
-            }
+        logger.error(f"Unexpected error: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__,
+            "query": query,
+            "executed_at": datetime.now().isoformat()
+        }
     
     def get_table_schema(self, table_name: str) -> Dict[str, Any]:
         """
@@ -145,7 +464,16 @@ class DatabaseTools:
             return {"error": result["error"]}
     
     def get_all_tables(self) -> List[str]:
-        """Get list of all tables in the database."""
+        """
+        Get list of all tables in the database.
+        
+        The table list rarely changes, so successful lookups are cached for
+        TABLE_LIST_TTL seconds to avoid repeated information_schema scans.
+        """
+        cached = self._tables_cache
+        if cached and time.monotonic() - cached[0] < self.TABLE_LIST_TTL:
+            return list(cached[1])
+        
         query = """
         SELECT table_name
         FROM information_schema.tables
@@ -157,10 +485,28 @@ class DatabaseTools:
         result = self.execute_query(query)
         
         if result["success"]:
-            return [row["table_name"] for row in result["data"]]
+            tables = [row["table_name"] for row in result["data"]]
+            self._tables_cache = (time.monotonic(), tables, frozenset(tables))
+            return list(tables)
         else:
             return []
     
+    def get_table_set(self) -> FrozenSet[str]:
+        """
+        Get all table names as a frozenset for O(1) membership checks.
+        
+        Shares the TABLE_LIST_TTL cache with get_all_tables.
+        """
+        cached = self._tables_cache
+        if not cached or time.monotonic() - cached[0] >= self.TABLE_LIST_TTL:
+            self.get_all_tables()
+            cached = self._tables_cache
+        return cached[2] if cached else frozenset()
+    
+    def table_exists(self, table_name: str) -> bool:
+        """Check whether a table exists in the public schema."""
+        return table_name in self.get_table_set()
+    
     def get_sample_data(self, table_name: str, limit: int = 5) -> Dict[str, Any]:
         """
         Get sample data from a table.
@@ -201,6 +547,71 @@ class DatabaseTools:
                 "error_code": e.pgcode
             }
     
+    def explain_query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the planner's plan for a query without running it or fetching rows.
+        
+        Useful for checking that a query reads the expected tables and uses
+        their indexes.
+        
+        Args:
+            query: SQL query to explain
+            params: Query parameters
+            
+        Returns:
+            Dictionary with the JSON plan, plus the node types and relations
+            it contains (in plan order)
+        """
+        result = self.execute_query(f"EXPLAIN (FORMAT JSON) {query}", params)
+        if not result["success"]:
+            return result
+        
+        plan = result["data"][0]["QUERY PLAN"]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        plan = plan[0]["Plan"]
+        
+        node_types, relations = [], []
+        nodes = [plan]
+        while nodes:
+            node = nodes.pop()
+            node_types.append(node["Node Type"])
+            if "Relation Name" in node:
+                relations.append(node["Relation Name"])
+            nodes.extend(reversed(node.get("Plans", [])))
+        
+        return {
+            "success": True,
+            "plan": plan,
+            "node_types": node_types,
+            "relations": relations,
+            "query": query
+        }
+    
+    def ping(self) -> Dict[str, Any]:
+        """
+        Check that the database answers a trivial query.
+        
+        Bypasses the query cache so the answer reflects the database now.
+        
+        Returns:
+            Dictionary with "reachable" and, on failure, the error
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+            return {"reachable": True}
+        except Exception as e:
+            return {
+                "reachable": False,
+                "error": str(e)
+            }
+    
     def get_table_row_count(self, table_name: str) -> int:
         """Get approximate row count for a table."""
         query = f'SELECT COUNT(*) as count FROM "{table_name}";'
@@ -213,12 +624,14 @@ class DatabaseTools:
 
 # Global database tools instance
 db_tools = DatabaseTools()
+atexit.register(db_tools.close)
 
 
 def run_sql_query(
     query: str,
     params: Optional[Dict[str, Any]] = None,
-    timeout: Optional[int] = None
+    timeout: Optional[int] = None,
+    max_rows: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Convenience function to execute SQL queries.
@@ -229,11 +642,48 @@ def run_sql_query(
         query: SQL query string
         params: Query parameters
         timeout: Query timeout in seconds
+        max_rows: Fetch at most this many rows (SELECT only)
         
     Returns:
         Dictionary with query results or error information
     """
-    return db_tools.execute_query(query, params, timeout)
+    return db_tools.execute_query(query, params, timeout, max_rows)
+
+
+def run_sql_query_iter(
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    fetch_size: int = 100
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the rows of a SELECT instead of returning them as one list.
+    
+    Args:
+        query: SQL query string
+        params: Query parameters
+        fetch_size: Rows fetched from the server per round-trip
+        
+    Returns:
+        Iterator of row dicts (database errors are raised)
+    """
+    return db_tools.iter_query(query, params, fetch_size)
+
+
+def run_sql_queries(
+    queries: List[Union[str, Tuple[str, Any]]],
+    timeout: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Execute several independent SQL queries on one database connection.
+    
+    Args:
+        queries: SQL strings, or (query, params) tuples
+        timeout: Query timeout in seconds
+        
+    Returns:
+        List of query results, in the same order as queries
+    """
+    return db_tools.execute_queries(queries, timeout)
 
 
 def get_schema_info(table_name: str) -> Dict[str, Any]:
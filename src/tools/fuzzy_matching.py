@@ -3,7 +3,7 @@ Fuzzy matching utilities for handling ambiguous entity names.
 """
 import re
 from typing import List, Dict, Tuple, Optional, Any
-from fuzzywuzzy import fuzz, process
+from rapidfuzz import fuzz, process, utils
 import logging
 
 logger = logging.getLogger(__name__)
@@ -57,17 +57,19 @@ class FuzzyMatcher:
         if not candidates:
             return []
         
-        # Get matches using fuzzywuzzy
+        # Score candidates with RapidFuzz (C++); default_process mirrors
+        # fuzzywuzzy's lowercase/strip preprocessing
         matches = process.extract(
             query,
             candidates,
             scorer=fuzz.token_sort_ratio,
-            limit=10
+            processor=utils.default_process,
+            limit=10,
+            score_cutoff=threshold
         )
         
-        # Filter by threshold and return
-        filtered_matches = [(match, score) for match, score in matches if score >= threshold]
-        return filtered_matches
+        # Round scores to ints to keep the 0-100 integer confidence contract
+        return [(match, int(round(score))) for match, score, _ in matches]
     
     def resolve_entity(
         self,
@@ -87,8 +89,9 @@ class FuzzyMatcher:
             Dictionary with resolution result
         """
         # Step 1: Exact match (case-insensitive)
+        query_lower = query.lower()
         for candidate in candidates:
-            if query.lower() == candidate.lower():
+            if query_lower == candidate.lower():
                 return {
                     "match_type": "exact",
                     "matched_value": candidate,
@@ -98,9 +101,10 @@ class FuzzyMatcher:
                 }
         
         # Step 2: Normalized match
-        normalized_query = self.normalize_string(query)
+        normalize = self.normalize_string
+        normalized_query = normalize(query)
         for candidate in candidates:
-            if normalized_query == self.normalize_string(candidate):
+            if normalized_query == normalize(candidate):
                 return {
                     "match_type": "normalized",
                     "matched_value": candidate,
@@ -198,8 +202,9 @@ class FuzzyMatcher:
         if entity_type not in self.entity_cache:
             return None
         
+        query_lower = query.lower()
         for canonical, variations in self.entity_cache[entity_type].items():
-            if query in variations or query.lower() in [v.lower() for v in variations]:
+            if query in variations or any(v.lower() == query_lower for v in variations):
                 return canonical
         
         return None
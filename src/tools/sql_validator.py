@@ -3,10 +3,54 @@ SQL Validator - Validates and auto-fixes SQL queries for data type issues.
 """
 import re
 import logging
+from functools import lru_cache
 from typing import List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Identifier-like tokens used to detect candidate date columns
+_IDENTIFIER_RE = re.compile(r'\b([a-z_][a-z0-9_]*)\b', re.IGNORECASE)
+
+# Date literals/functions a TEXT date column may be compared against
+_DATE_VALUE = r"(CURRENT_DATE|CURRENT_TIMESTAMP|NOW\(\)|\'[\d\-]+\')"
+
+# Statements validate_query_syntax accepts (longest keyword is 6 chars)
+_STATEMENT_KEYWORDS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+
+@lru_cache(maxsize=512)
+def _date_fix_patterns(col: str) -> Tuple[Tuple["re.Pattern[str]", str, str], ...]:
+    """
+    Compile the date-casting rewrite rules for a column once.
+    
+    Args:
+        col: Column name
+        
+    Returns:
+        Tuple of (compiled_pattern, replacement, description) rules
+    """
+    name = re.escape(col)
+    rules = [
+        # Fix 1: Date comparisons (col < CURRENT_DATE)
+        (rf'\b{name}\b\s*(<|>|<=|>=|=)\s*{_DATE_VALUE}', rf'{col}::DATE \1 \2::DATE', "comparison"),
+        # Fix 2: EXTRACT from date column
+        (rf'EXTRACT\s*\(\s*([A-Z]+)\s+FROM\s+{name}\b', rf'EXTRACT(\1 FROM {col}::DATE', "EXTRACT"),
+        # Fix 3: Date arithmetic (col - CURRENT_DATE)
+        (rf'\(\s*{name}\s*-\s*{_DATE_VALUE}', rf'({col}::DATE - \1::DATE', "arithmetic"),
+        # Fix 4: Date arithmetic (CURRENT_DATE - col)
+        (rf'\(\s*{_DATE_VALUE}\s*-\s*{name}\b', rf'(\1::DATE - {col}::DATE', "arithmetic"),
+        # Fix 5: INTERVAL arithmetic (col + INTERVAL)
+        (rf'{name}\b\s*\+\s*INTERVAL', f'{col}::DATE + INTERVAL', "INTERVAL arithmetic"),
+        # Fix 6: WHERE col BETWEEN dates
+        (rf'WHERE\s+{name}\b\s+BETWEEN', f'WHERE {col}::DATE BETWEEN', "BETWEEN"),
+        # Fix 7: ORDER BY date column
+        (rf'ORDER\s+BY\s+{name}\b', f'ORDER BY {col}::DATE', "ORDER BY"),
+    ]
+    return tuple(
+        (re.compile(pattern, re.IGNORECASE), replacement, description)
+        for pattern, replacement, description in rules
+    )
+
 
 class SQLValidator:
     """Validates and fixes SQL queries for common data type issues."""
@@ -69,56 +113,14 @@ class SQLValidator:
         columns_to_check = text_date_columns or SQLValidator._detect_date_columns(query)
         
         for col in columns_to_check:
-            # Fix 1: Date comparisons (col < CURRENT_DATE)
-            pattern = rf'\b{re.escape(col)}\b\s*(<|>|<=|>=|=)\s*(CURRENT_DATE|CURRENT_TIMESTAMP|NOW\(\)|\'[\d\-]+\')'
-            if re.search(pattern, fixed_query, re.IGNORECASE):
-                replacement = rf'{col}::DATE \1 \2::DATE'
-                fixed_query = re.sub(pattern, replacement, fixed_query, flags=re.IGNORECASE)
-                fixes.append(f"Added ::DATE casting to comparison: {col}")
-            
-            # Fix 2: EXTRACT from date column
-            pattern = rf'EXTRACT\s*\(\s*([A-Z]+)\s+FROM\s+{re.escape(col)}\b'
-            if re.search(pattern, fixed_query, re.IGNORECASE):
-                replacement = rf'EXTRACT(\1 FROM {col}::DATE'
-                fixed_query = re.sub(pattern, replacement, fixed_query, flags=re.IGNORECASE)
-                fixes.append(f"Added ::DATE casting to EXTRACT: {col}")
-            
-            # Fix 3: Date arithmetic (col - CURRENT_DATE)
-            pattern = rf'\(\s*{re.escape(col)}\s*-\s*(CURRENT_DATE|CURRENT_TIMESTAMP|NOW\(\)|\'[\d\-]+\')'
-            if re.search(pattern, fixed_query, re.IGNORECASE):
-                replacement = rf'({col}::DATE - \1::DATE'
-                fixed_query = re.sub(pattern, replacement, fixed_query, flags=re.IGNORECASE)
-                fixes.append(f"Added ::DATE casting to arithmetic: {col}")
-            
-            # Fix 4: Date arithmetic (CURRENT_DATE - col)
-            pattern = rf'\(\s*(CURRENT_DATE|CURRENT_TIMESTAMP|NOW\(\)|\'[\d\-]+\')\s*-\s*{re.escape(col)}\b'
-            if re.search(pattern, fixed_query, re.IGNORECASE):
-                replacement = rf'(\1::DATE - {col}::DATE'
-                fixed_query = re.sub(pattern, replacement, fixed_query, flags=re.IGNORECASE)
-                fixes.append(f"Added ::DATE casting to arithmetic: {col}")
-            
-            # Fix 5: INTERVAL arithmetic (col + INTERVAL)
-            pattern = rf'{re.escape(col)}\b\s*\+\s*INTERVAL'
-            if re.search(pattern, fixed_query, re.IGNORECASE):
-                replacement = f'{col}::DATE + INTERVAL'
-                fixed_query = re.sub(pattern, replacement, fixed_query, flags=re.IGNORECASE)
-                fixes.append(f"Added ::DATE casting to INTERVAL arithmetic: {col}")
-            
-            # Fix 6: WHERE col BETWEEN dates
-            pattern = rf'WHERE\s+{re.escape(col)}\b\s+BETWEEN'
-            if re.search(pattern, fixed_query, re.IGNORECASE):
-                replacement = f'WHERE {col}::DATE BETWEEN'
-                fixed_query = re.sub(pattern, replacement, fixed_query, flags=re.IGNORECASE)
-                fixes.append(f"Added ::DATE casting to BETWEEN: {col}")
-            
-            # Fix 7: ORDER BY date column
-            pattern = rf'ORDER\s+BY\s+{re.escape(col)}\b'
-            if re.search(pattern, fixed_query, re.IGNORECASE):
-                # Only add casting if not already present
-                if f'{col}::DATE' not in fixed_query:
-                    replacement = f'ORDER BY {col}::DATE'
-                    fixed_query = re.sub(pattern, replacement, fixed_query, flags=re.IGNORECASE)
-                    fixes.append(f"Added ::DATE casting to ORDER BY: {col}")
+            for pattern, replacement, description in _date_fix_patterns(col):
+                if not pattern.search(fixed_query):
+                    continue
+                # ORDER BY: only add casting if not already present
+                if description == "ORDER BY" and f'{col}::DATE' in fixed_query:
+                    continue
+                fixed_query = pattern.sub(replacement, fixed_query)
+                fixes.append(f"Added ::DATE casting to {description}: {col}")
         
         return fixed_query, fixes
     
@@ -136,9 +138,7 @@ class SQLValidator:
         detected = []
         
         # Find all column references in the query
-        # Pattern: word characters that look like column names
-        pattern = r'\b([a-z_][a-z0-9_]*)\b'
-        matches = re.findall(pattern, query, re.IGNORECASE)
+        matches = _IDENTIFIER_RE.findall(query)
         
         # Check if any match known date column patterns
         for match in matches:
@@ -162,13 +162,12 @@ class SQLValidator:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        if not query or not query.strip():
+        stripped = query.lstrip() if query else ""
+        if not stripped:
             return False, "Query is empty"
         
-        query_upper = query.upper().strip()
-        
-        # Check for required keywords
-        if not any(query_upper.startswith(kw) for kw in ['SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH']):
+        # Check for required keywords (only the leading keyword is upper-cased)
+        if not stripped[:6].upper().startswith(_STATEMENT_KEYWORDS):
             return False, "Query must start with SELECT, INSERT, UPDATE, DELETE, or WITH"
         
         # Check for balanced parentheses
@@ -5,9 +5,15 @@ Uses OpenAI's embedding model to convert table schemas to vectors
 and store them in ChromaDB for semantic search.
 """
 import os
+import hashlib
 import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import closing
 from typing import Dict, List, Any, Optional
 import chromadb
+import numpy as np
 from openai import OpenAI
 
 from src.utils.schema_registry import TABLE_SCHEMAS, get_all_table_names
@@ -15,6 +21,10 @@ from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Stands in for _schema_index once the collection is too large for flat
+# search, so later searches skip the collection.count() call
+_USE_HNSW_INDEX = object()
+
 
 class ChromaSchemaManagerOpenAI:
     """
@@ -27,6 +37,19 @@ class ChromaSchemaManagerOpenAI:
     - Enables semantic search across all 40 tables
     """
     
+    # Number of query embeddings kept in the in-process LRU cache
+    QUERY_EMBEDDING_CACHE_SIZE = 256
+    
+    # SQLite file (inside persist_dir) that keeps query embeddings across runs
+    QUERY_EMBEDDING_DB = "query_embeddings.sqlite3"
+    
+    # Rows kept in the on-disk query embedding cache; the oldest are deleted
+    QUERY_EMBEDDING_DB_MAX_ROWS = 10000
+    
+    # Above this many tables, exact in-memory search gives way to
+    # ChromaDB's HNSW index (logarithmic rather than linear query cost)
+    FLAT_SEARCH_MAX_TABLES = 1000
+    
     def __init__(
         self,
         persist_dir: str = "./chroma_db",
@@ -60,6 +83,14 @@ class ChromaSchemaManagerOpenAI:
         # Initialize ChromaDB with new API (no Settings needed)
         self.client = chromadb.PersistentClient(path=persist_dir)
         self.collection = None
+        self._query_embedding_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self._query_db_path = os.path.join(persist_dir, self.QUERY_EMBEDDING_DB)
+        # (ids, L2-normalised float32 embedding matrix, metadatas) used for
+        # exact in-memory search, or _USE_HNSW_INDEX; rebuilt lazily after
+        # the collection changes
+        self._schema_index = None
+        self._schema_index_lock = threading.Lock()
         self._initialize_collection()
     
     def _initialize_collection(self):
@@ -81,16 +112,26 @@ class ChromaSchemaManagerOpenAI:
             )
             # Populate with table schemas
             self._populate_schemas()
+            return
+        
+        # Re-embed only schemas that changed since the collection was built
+        try:
+            self._sync_schemas()
+        except Exception as e:
+            logger.warning(f"Could not sync ChromaDB schemas, using stored embeddings: {e}")
     
-    def _populate_schemas(self):
-        """Populate ChromaDB with all table schemas using OpenAI embeddings."""
-        logger.info("Populating ChromaDB with table schemas (OpenAI embeddings)...")
+    def _build_schema_entries(self) -> tuple[List[str], List[str], List[Dict[str, Any]]]:
+        """
+        Build ids, documents and metadata for every table in the registry.
         
+        Each metadata entry carries a SHA-256 hash of its document and the
+        embedding model, so unchanged schemas can be detected without
+        re-embedding them.
+        """
+        ids = []
         documents = []
         metadatas = []
-        ids = []
         
-        # Create documents for all tables
         for table_name, schema_info in TABLE_SCHEMAS.items():
             doc = self._create_schema_document(table_name, schema_info)
             documents.append(doc)
@@ -100,11 +141,82 @@ class ChromaSchemaManagerOpenAI:
                 "business_purpose": schema_info.get("business_purpose", ""),
                 "workflow": ",".join(schema_info.get("workflow", [])),
                 "column_count": len(schema_info.get("key_columns", [])),
-                "keywords": ",".join(schema_info.get("keywords", []))
+                "keywords": ",".join(schema_info.get("keywords", [])),
+                "content_hash": hashlib.sha256(
+                    f"{self.embedding_model}\n{doc}".encode("utf-8")
+                ).hexdigest()
             }
             metadatas.append(metadata)
             ids.append(table_name)
         
+        return ids, documents, metadatas
+    
+    def _sync_schemas(self):
+        """
+        Bring an existing collection in line with the schema registry.
+        
+        Only tables whose document hash is missing or different are embedded
+        (in a single batched OpenAI call); tables no longer in the registry
+        are removed. Entries stored before hashes were recorded get the hash
+        backfilled when their document text is unchanged, assuming they were
+        embedded with the current model.
+        """
+        ids, documents, metadatas = self._build_schema_entries()
+        
+        existing = self.collection.get(include=["metadatas", "documents"])
+        stored_hashes = {
+            table_id: (metadata or {}).get("content_hash")
+            for table_id, metadata in zip(existing["ids"], existing["metadatas"] or [])
+        }
+        stored_documents = dict(zip(existing["ids"], existing["documents"] or []))
+        
+        stale = [
+            i for i, table_id in enumerate(ids)
+            if stored_hashes.get(table_id) != metadatas[i]["content_hash"]
+        ]
+        removed = [table_id for table_id in stored_hashes if table_id not in TABLE_SCHEMAS]
+        
+        unhashed = [
+            i for i in stale
+            if ids[i] in stored_hashes and stored_hashes[ids[i]] is None
+            and stored_documents.get(ids[i]) == documents[i]
+        ]
+        if unhashed:
+            self.collection.update(
+                ids=[ids[i] for i in unhashed],
+                metadatas=[metadatas[i] for i in unhashed]
+            )
+            logger.info(f"Recorded content hashes for {len(unhashed)} unchanged table schemas")
+            backfilled = set(unhashed)
+            stale = [i for i in stale if i not in backfilled]
+        
+        if removed:
+            self.collection.delete(ids=removed)
+            self._schema_index = None
+            logger.info(f"Removed {len(removed)} tables no longer in the registry")
+        
+        if not stale:
+            logger.info("ChromaDB schemas are up to date")
+            return
+        
+        self._schema_index = None
+        logger.info(f"Re-embedding {len(stale)} new or changed table schemas...")
+        embeddings = self._generate_embeddings([documents[i] for i in stale])
+        self.collection.upsert(
+            ids=[ids[i] for i in stale],
+            documents=[documents[i] for i in stale],
+            embeddings=embeddings,
+            metadatas=[metadatas[i] for i in stale]
+        )
+        logger.info(f"✓ Updated {len(stale)} table schemas in ChromaDB")
+    
+    def _populate_schemas(self):
+        """Populate ChromaDB with all table schemas using OpenAI embeddings."""
+        logger.info("Populating ChromaDB with table schemas (OpenAI embeddings)...")
+        
+        # Create documents for all tables
+        ids, documents, metadatas = self._build_schema_entries()
+        
         logger.info(f"Created {len(documents)} schema documents")
         
         # Generate embeddings using OpenAI
@@ -123,6 +235,7 @@ class ChromaSchemaManagerOpenAI:
             metadatas=metadatas,
             ids=ids
         )
+        self._schema_index = None
         
         logger.info(f"✓ Populated ChromaDB with {len(documents)} table schemas")
     
@@ -199,11 +312,124 @@ class ChromaSchemaManagerOpenAI:
             logger.error(f"Failed to generate embeddings: {e}")
             raise
     
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed several queries with a single OpenAI API call.
+        
+        Recently embedded queries are served from an in-process LRU cache,
+        then from an on-disk SQLite cache in persist_dir; only the remaining
+        ones are sent to OpenAI.
+        
+        Args:
+            queries: Natural language queries
+            
+        Returns:
+            List of embedding vectors in the same order as queries
+        """
+        if not queries:
+            return []
+        
+        keys = [" ".join(query.split()) for query in queries]
+        embeddings: Dict[str, List[float]] = {}
+        
+        with self._query_cache_lock:
+            for key in keys:
+                if key in self._query_embedding_cache:
+                    self._query_embedding_cache.move_to_end(key)
+                    embeddings[key] = self._query_embedding_cache[key]
+        
+        missing = list(dict.fromkeys(key for key in keys if key not in embeddings))
+        if missing:
+            # Fall back to the on-disk cache, then to OpenAI for the rest
+            fetched = self._load_stored_query_embeddings(missing)
+            to_embed = [key for key in missing if key not in fetched]
+            if to_embed:
+                generated = dict(zip(to_embed, self._generate_embeddings(to_embed)))
+                self._store_query_embeddings(generated)
+                fetched.update(generated)
+            with self._query_cache_lock:
+                for key in missing:
+                    vector = fetched[key]
+                    embeddings[key] = vector
+                    self._query_embedding_cache[key] = vector
+                    self._query_embedding_cache.move_to_end(key)
+                while len(self._query_embedding_cache) > self.QUERY_EMBEDDING_CACHE_SIZE:
+                    self._query_embedding_cache.popitem(last=False)
+        else:
+            logger.info(f"Query embedding cache hit for {len(keys)} queries")
+        
+        return [embeddings[key] for key in keys]
+    
+    def _query_embedding_key(self, query: str) -> str:
+        """Key an on-disk query embedding by model and normalized query text."""
+        return hashlib.sha256(f"{self.embedding_model}\n{query}".encode("utf-8")).hexdigest()
+    
+    def _connect_query_db(self) -> sqlite3.Connection:
+        """Open the on-disk query embedding cache, creating its table if needed."""
+        conn = sqlite3.connect(self._query_db_path, timeout=5)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_embeddings (key TEXT PRIMARY KEY, embedding BLOB NOT NULL)"
+        )
+        return conn
+    
+    def _load_stored_query_embeddings(self, queries: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up query embeddings persisted by earlier runs.
+        
+        Args:
+            queries: Normalized query texts
+            
+        Returns:
+            Dictionary mapping query text to embedding for the queries found
+        """
+        keyed = {self._query_embedding_key(query): query for query in queries}
+        try:
+            with closing(self._connect_query_db()) as conn:
+                rows = conn.execute(
+                    f"SELECT key, embedding FROM query_embeddings WHERE key IN ({','.join('?' * len(keyed))})",
+                    list(keyed)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read query embedding cache: {e}")
+            return {}
+        
+        if rows:
+            logger.info(f"Loaded {len(rows)} query embeddings from disk cache")
+        return {
+            keyed[key]: np.frombuffer(blob, dtype=np.float32).tolist()
+            for key, blob in rows
+        }
+    
+    def _store_query_embeddings(self, embeddings: Dict[str, List[float]]):
+        """
+        Persist query embeddings (stored as float32) for later runs.
+        
+        Keeps the newest QUERY_EMBEDDING_DB_MAX_ROWS rows; INSERT OR REPLACE
+        gives a re-stored query a new rowid, so rowid order is insertion order.
+        """
+        try:
+            with closing(self._connect_query_db()) as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO query_embeddings (key, embedding) VALUES (?, ?)",
+                    [
+                        (self._query_embedding_key(query), np.asarray(vector, dtype=np.float32).tobytes())
+                        for query, vector in embeddings.items()
+                    ]
+                )
+                conn.execute(
+                    "DELETE FROM query_embeddings WHERE rowid NOT IN "
+                    "(SELECT rowid FROM query_embeddings ORDER BY rowid DESC LIMIT ?)",
+                    (self.QUERY_EMBEDDING_DB_MAX_ROWS,)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write query embedding cache: {e}")
+    
     def find_relevant_tables(
         self,
         query: str,
         n_results: int = 5,
-        workflow: Optional[str] = None
+        workflow: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Find relevant tables for a query using semantic search.
@@ -212,21 +438,32 @@ class ChromaSchemaManagerOpenAI:
             query: Natural language query
             n_results: Number of results to return
             workflow: Optional workflow filter ("A" or "B")
+            query_embedding: Pre-computed embedding for query (optional)
             
         Returns:
             List of relevant tables with scores
         """
         try:
-            # Generate embedding for query
-            logger.info(f"Generating embedding for query: {query[:50]}...")
-            query_embedding = self._generate_embeddings([query])[0]
+            # Generate embedding for query unless one was supplied
+            if query_embedding is None:
+                logger.info(f"Generating embedding for query: {query[:50]}...")
+                query_embedding = self.embed_queries([query])[0]
             
-            # Query ChromaDB
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results,
-                where=self._build_where_clause(workflow) if workflow else None
-            )
+            where = self._build_where_clause(workflow) if workflow else None
+            results = None
+            if where is None:
+                try:
+                    results = self._search_schema_index(query_embedding, n_results)
+                except Exception as e:
+                    logger.warning(f"In-memory schema search failed, querying ChromaDB: {e}")
+            
+            if results is None:
+                # Query ChromaDB
+                results = self.collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=n_results,
+                    where=where
+                )
             
             # Format results
             tables = []
@@ -253,6 +490,71 @@ class ChromaSchemaManagerOpenAI:
             logger.error(f"Error querying ChromaDB: {e}")
             raise
     
+    def _load_schema_index(self):
+        """
+        Load all stored embeddings into an L2-normalised float32 matrix.
+        
+        Returns None when the collection is larger than
+        FLAT_SEARCH_MAX_TABLES, so queries go to ChromaDB's HNSW index; that
+        decision is kept until the collection changes.
+        """
+        if self._schema_index is _USE_HNSW_INDEX:
+            return None
+        with self._schema_index_lock:
+            if self._schema_index is None:
+                if self.collection.count() > self.FLAT_SEARCH_MAX_TABLES:
+                    self._schema_index = _USE_HNSW_INDEX
+                    return None
+                stored = self.collection.get(include=["embeddings", "metadatas"])
+                matrix = np.asarray(stored["embeddings"], dtype=np.float32)
+                if matrix.ndim != 2 or not len(stored["ids"]):
+                    return None
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                matrix /= np.where(norms == 0, 1, norms)
+                self._schema_index = (
+                    list(stored["ids"]),
+                    matrix,
+                    list(stored["metadatas"] or [{}] * len(stored["ids"]))
+                )
+                logger.info(f"Loaded {len(matrix)} schema embeddings for in-memory search")
+            if self._schema_index is _USE_HNSW_INDEX:
+                return None
+            return self._schema_index
+    
+    def _search_schema_index(
+        self,
+        query_embedding: List[float],
+        n_results: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Exact cosine search over the in-memory schema matrix.
+        
+        Returns results shaped like ``collection.query`` (squared L2 distances
+        of unit vectors), or None if the index is unavailable.
+        """
+        index = self._load_schema_index()
+        if index is None:
+            return None
+        ids, matrix, metadatas = index
+        
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query_vec)
+        if norm == 0:
+            return None
+        scores = matrix @ (query_vec / norm)
+        
+        k = min(n_results, len(ids))
+        if k <= 0:
+            return None
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(ids) else np.arange(len(ids))
+        top = top[np.argsort(-scores[top])]
+        
+        return {
+            "ids": [[ids[i] for i in top]],
+            "distances": [[float(2 - 2 * scores[i]) for i in top]],
+            "metadatas": [[metadatas[i] for i in top]]
+        }
+    
     def _build_where_clause(self, workflow: str) -> Optional[Dict[str, Any]]:
         """Build ChromaDB where clause for workflow filtering.
         
@@ -276,25 +578,41 @@ class ChromaSchemaManagerOpenAI:
         Returns:
             Schema document or None if not found
         """
+        return self.get_table_schema_documents([table_name]).get(table_name)
+    
+    def get_table_schema_documents(self, table_names: List[str]) -> Dict[str, str]:
+        """
+        Get schema documents for several tables in one ChromaDB lookup.
+        
+        Args:
+            table_names: Names of the tables
+            
+        Returns:
+            Dictionary mapping table name to schema document (missing tables omitted)
+        """
+        if not table_names:
+            return {}
         try:
-            result = self.collection.get(ids=[table_name])
-            if result and result["documents"] and len(result["documents"]) > 0:
-                return result["documents"][0]
-            return None
+            result = self.collection.get(
+                ids=list(dict.fromkeys(table_names)),
+                include=["documents"]
+            )
+            if not result or not result["documents"]:
+                return {}
+            return dict(zip(result["ids"], result["documents"]))
         except Exception as e:
-            logger.error(f"Error retrieving schema document for {table_name}: {e}")
-            return None
+            logger.error(f"Error retrieving schema documents for {table_names}: {e}")
+            return {}
     
     def refresh_schemas(self):
-        """Refresh ChromaDB with latest schemas from registry."""
+        """
+        Refresh ChromaDB with latest schemas from registry.
+        
+        Only new or changed schemas are re-embedded.
+        """
         try:
             logger.info("Refreshing ChromaDB schemas...")
-            # Delete existing collection
-            self.client.delete_collection(name=self.collection_name)
-            logger.info("Deleted existing ChromaDB collection")
-            
-            # Reinitialize
-            self._initialize_collection()
+            self._sync_schemas()
             logger.info("✓ Refreshed ChromaDB with latest schemas")
         except Exception as e:
             logger.error(f"Error refreshing schemas: {e}")
@@ -309,6 +627,13 @@ class ChromaSchemaManagerOpenAI:
             logger.error(f"Error getting all tables: {e}")
             return []
     
+    def warm_up(self):
+        """Load the in-memory schema index ahead of the first query."""
+        try:
+            self._load_schema_index()
+        except Exception as e:
+            logger.warning(f"Could not preload schema embeddings: {e}")
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the ChromaDB collection."""
         try:
@@ -327,6 +652,7 @@ class ChromaSchemaManagerOpenAI:
 
 # Global instance
 _chroma_manager_openai: Optional[ChromaSchemaManagerOpenAI] = None
+_chroma_manager_lock = threading.Lock()
 
 
 def get_chroma_manager_openai(
@@ -346,9 +672,11 @@ def get_chroma_manager_openai(
     global _chroma_manager_openai
     
     if _chroma_manager_openai is None:
-        _chroma_manager_openai = ChromaSchemaManagerOpenAI(
-            persist_dir=persist_dir,
-            openai_api_key=openai_api_key
-        )
+        with _chroma_manager_lock:
+            if _chroma_manager_openai is None:
+                _chroma_manager_openai = ChromaSchemaManagerOpenAI(
+                    persist_dir=persist_dir,
+                    openai_api_key=openai_api_key
+                )
     
     return _chroma_manager_openai
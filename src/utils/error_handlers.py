@@ -2,7 +2,8 @@
 Error handling utilities for graceful failure management.
 """
 import logging
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -39,7 +40,8 @@ class SQLErrorHandler:
         )
         
         # Extract relevant details from error message
-        if "column" in error_message.lower():
+        message_lower = error_message.lower()
+        if "column" in message_lower:
             # Extract column name
             import re
             match = re.search(r'column "([^"]+)"', error_message)
@@ -47,7 +49,7 @@ class SQLErrorHandler:
                 column_name = match.group(1)
                 return f"{base_translation}: '{column_name}'"
         
-        if "table" in error_message.lower():
+        if "table" in message_lower:
             # Extract table name
             import re
             match = re.search(r'table "([^"]+)"', error_message)
@@ -134,18 +136,7 @@ class AgentErrorHandler:
         Returns:
             User-friendly message
         """
-        message = f"I couldn't find {entity_type} '{entity_value}' in the system.\n\n"
-        message += "What I checked:\n"
-        
-        for table in tables_checked:
-            message += f"- {table}: No record\n"
-        
-        message += "\nPossible reasons:\n"
-        message += f"1. {entity_type.capitalize()} may be formatted differently\n"
-        message += f"2. {entity_type.capitalize()} fully consumed and archived\n"
-        message += f"3. {entity_type.capitalize()} belongs to different study not in database\n"
-        
-        return message
+        return _missing_data_message(entity_type, entity_value, tuple(tables_checked))
     
     @staticmethod
     def handle_conflicting_data(
@@ -162,18 +153,37 @@ class AgentErrorHandler:
         Returns:
             User-friendly message explaining conflicts
         """
-        message = f"I found conflicting data for {entity}:\n\n"
+        lines = [f"I found conflicting data for {entity}:\n"]
         
         for i, conflict in enumerate(conflicts, 1):
-            message += f"Source {i} - {conflict['table']} "
-            if 'updated' in conflict:
-                message += f"(updated: {conflict['updated']})"
-            message += f": {conflict['value']}\n"
+            updated = f"(updated: {conflict['updated']})" if 'updated' in conflict else ""
+            lines.append(f"Source {i} - {conflict['table']} {updated}: {conflict['value']}")
         
-        message += "\nNote: Data discrepancies may indicate recent updates not yet synchronized across all systems. "
-        message += "Use the most recent source for critical decisions.\n"
+        lines.append(
+            "\nNote: Data discrepancies may indicate recent updates not yet synchronized across all systems. "
+            "Use the most recent source for critical decisions.\n"
+        )
         
-        return message
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=256)
+def _missing_data_message(
+    entity_type: str,
+    entity_value: str,
+    tables_checked: Tuple[str, ...]
+) -> str:
+    """Build (and memoize) the missing-data message for handle_missing_data."""
+    entity_label = entity_type.capitalize()
+    lines = [f"I couldn't find {entity_type} '{entity_value}' in the system.\n", "What I checked:"]
+    lines.extend(f"- {table}: No record" for table in tables_checked)
+    lines.extend([
+        "\nPossible reasons:",
+        f"1. {entity_label} may be formatted differently",
+        f"2. {entity_label} fully consumed and archived",
+        f"3. {entity_label} belongs to different study not in database\n"
+    ])
+    return "\n".join(lines)
 
 
 def format_error_for_user(error: Dict[str, Any]) -> str:
@@ -0,0 +1,77 @@
+"""
+Record/replay store for workflow responses.
+
+Keeps deterministic, offline runs possible (e.g. table-selection checks in
+CI): the first run records each successful response keyed by the SHA-256 of
+the normalized query and its context; later runs replay it without touching
+the LLM or the database.
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseReplay:
+    """JSON-file backed store of workflow responses keyed by query hash."""
+    
+    def __init__(self, path: str):
+        """
+        Initialize replay store.
+        
+        Args:
+            path: JSON fixture file (created on first record)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._responses: Dict[str, Dict[str, Any]] = {}
+        
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._responses = json.load(f)
+            logger.info(f"Loaded {len(self._responses)} recorded responses from {path}")
+    
+    @staticmethod
+    def _key(query: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """Hash the whitespace-normalized query and the serialized context."""
+        text = " ".join(query.split())
+        if context:
+            # Queries recorded without context keep their original keys
+            text += "\n" + json.dumps(context, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    def get(self, query: str, context: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the recorded response for a query.
+        
+        Args:
+            query: User query
+            context: Context the query was executed with (optional)
+            
+        Returns:
+            Deep copy of the recorded response, or None if not recorded
+        """
+        response = self._responses.get(self._key(query, context))
+        return copy.deepcopy(response) if response is not None else None
+    
+    def record(self, query: str, response: Dict[str, Any], context: Optional[Dict[str, Any]] = None):
+        """
+        Record a response and persist the fixture file.
+        
+        Args:
+            query: User query
+            response: Workflow result (must be JSON-serializable via str fallback)
+            context: Context the query was executed with (optional)
+        """
+        with self._lock:
+            self._responses[self._key(query, context)] = json.loads(json.dumps(response, default=str))
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._responses, f, indent=2, sort_keys=True)
@@ -8,12 +8,13 @@ Two main workflows:
 Main entry point: WorkflowOrchestrator or get_orchestrator()
 """
 from .workflow_a import SupplyWatchdogWorkflow
-from .workflow_b_v2_openai import ScenarioStrategistWorkflowV2OpenAI
+from .workflow_b_v2_openai import ScenarioStrategistWorkflowV2OpenAI, get_scenario_strategist_workflow
 from .orchestrator import WorkflowOrchestrator, get_orchestrator
 
 __all__ = [
     "SupplyWatchdogWorkflow",
     "ScenarioStrategistWorkflowV2OpenAI",
+    "get_scenario_strategist_workflow",
     "WorkflowOrchestrator",
     "get_orchestrator",
 ]
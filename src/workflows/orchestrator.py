@@ -3,11 +3,17 @@ Main orchestrator for Clinical Supply Chain Control Tower workflows.
 
 This module provides a unified interface to execute both workflows.
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from src.agents import RouterAgent, SynthesisAgent
+from src.tools.database_tools import db_tools
 
 from .workflow_a import SupplyWatchdogWorkflow
-from .workflow_b_v2_openai import ScenarioStrategistWorkflowV2OpenAI
+from .workflow_b_v2_openai import get_scenario_strategist_workflow
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +35,20 @@ class WorkflowOrchestrator:
             llm: Language model instance (optional)
         """
         self.llm = llm
-        self.workflow_a = SupplyWatchdogWorkflow(llm)
-        self.workflow_b = ScenarioStrategistWorkflowV2OpenAI(llm)
+        # Stateless agents are shared by both workflows instead of built twice
+        router = RouterAgent(llm)
+        synthesis = SynthesisAgent(llm)
+        # Build both workflows concurrently; their agents' clients and the
+        # ChromaDB collection load are I/O-bound
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            workflow_a_future = executor.submit(
+                SupplyWatchdogWorkflow, llm, router=router, synthesis=synthesis
+            )
+            workflow_b_future = executor.submit(
+                get_scenario_strategist_workflow, llm, router=router, synthesis=synthesis
+            )
+            self.workflow_a = workflow_a_future.result()
+            self.workflow_b = workflow_b_future.result()
         self.logger = logging.getLogger("orchestrator")
     
     def run_supply_watchdog(self, trigger_type: str = "manual") -> Dict[str, Any]:
@@ -43,13 +61,14 @@ class WorkflowOrchestrator:
         Returns:
             Dictionary with monitoring results and JSON output
         """
-        self.logger.info(f"Running Supply Watchdog (trigger: {trigger_type})")
+        self.logger.info("Running Supply Watchdog (trigger: %s)", trigger_type)
         return self.workflow_a.execute(trigger_type)
     
     def run_scenario_strategist(
         self,
         query: str,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        stream: bool = False
     ) -> Dict[str, Any]:
         """
         Run Scenario Strategist workflow (Workflow B).
@@ -57,12 +76,84 @@ class WorkflowOrchestrator:
         Args:
             query: User query
             context: Optional context from previous interactions
+            stream: Return general-query responses as an iterator of text
+                chunks, so callers can render the first tokens immediately
             
         Returns:
             Dictionary with response and citations
         """
-        self.logger.info(f"Running Scenario Strategist for query: {query}")
-        return self.workflow_b.execute(query, context)
+        self.logger.info("Running Scenario Strategist for query: %s", query)
+        return self.workflow_b.execute(query, context, stream=stream)
+    
+    async def a_run_supply_watchdog(self, trigger_type: str = "manual") -> Dict[str, Any]:
+        """
+        Async variant of run_supply_watchdog.
+        
+        The workflow runs in a worker thread, so several runs can be awaited
+        together (e.g. with asyncio.gather) and overlap their LLM/DB latency.
+        
+        Args:
+            trigger_type: "manual" or "scheduled"
+            
+        Returns:
+            Dictionary with monitoring results and JSON output
+        """
+        return await asyncio.to_thread(self.run_supply_watchdog, trigger_type)
+    
+    async def a_run_scenario_strategist(
+        self,
+        query: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of run_scenario_strategist.
+        
+        Args:
+            query: User query
+            context: Optional context from previous interactions
+            
+        Returns:
+            Dictionary with response and citations
+        """
+        return await asyncio.to_thread(self.run_scenario_strategist, query, context)
+    
+    def run_scenario_strategist_many(
+        self,
+        queries: List[str],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run Scenario Strategist for several independent queries at once.
+        
+        Query embeddings are fetched in one batch and the queries run
+        concurrently, so their LLM round-trips overlap.
+        
+        Args:
+            queries: User queries
+            context: Optional context shared by all queries
+            
+        Returns:
+            List of results in the same order as queries
+        """
+        self.logger.info("Running Scenario Strategist for %s queries", len(queries))
+        return self.workflow_b.execute_many(queries, context)
+    
+    async def a_run_scenario_strategist_many(
+        self,
+        queries: List[str],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of run_scenario_strategist_many.
+        
+        Args:
+            queries: User queries
+            context: Optional context shared by all queries
+            
+        Returns:
+            List of results in the same order as queries
+        """
+        return await asyncio.to_thread(self.run_scenario_strategist_many, queries, context)
     
     def check_shelf_life_extension(
         self,
@@ -81,10 +172,27 @@ class WorkflowOrchestrator:
         Returns:
             Dictionary with feasibility assessment
         """
-        self.logger.info(f"Checking shelf-life extension: {batch_id} for {country}")
+        self.logger.info("Checking shelf-life extension: %s for %s", batch_id, country)
         query = f"Can we extend the expiry of Batch {batch_id} for {country}?"
         return self.workflow_b.execute(query)
     
+    def warm_up(self):
+        """
+        Pay cold-start costs up front instead of on the first request.
+        
+        Opens the database connection pool, fills the table-list cache and
+        loads the schema embeddings used by Workflow B. Failures are logged,
+        not raised; the lazy paths still work.
+        """
+        self.logger.info("Warming up orchestrator")
+        try:
+            tables = db_tools.get_all_tables()
+            self.logger.info("Database pool ready (%s tables)", len(tables))
+        except Exception as e:
+            self.logger.warning("Database warm-up failed: %s", e)
+        
+        self.workflow_b.schema_retrieval.warm_up()
+    
     def get_workflow_summary(self, result: Dict[str, Any]) -> str:
         """
         Generate human-readable summary of workflow execution.
@@ -126,22 +234,32 @@ class WorkflowOrchestrator:
             health["agents"]["synthesis"] = "healthy" if self.workflow_a.synthesis else "missing"
             
             # Check Workflow B agents
-            health["agents"]["regulatory"] = "healthy" if self.workflow_b.regulatory else "missing"
-            health["agents"]["logistics"] = "healthy" if self.workflow_b.logistics else "missing"
+            health["agents"]["schema_retrieval"] = "healthy" if self.workflow_b.schema_retrieval else "missing"
+            health["agents"]["sql_generation"] = "healthy" if self.workflow_b.sql_generation else "missing"
+            
+            # Check the database with one cheap round-trip, so callers can
+            # bail out early instead of waiting on each workflow to time out
+            ping = db_tools.ping()
+            health["database"] = "healthy" if ping["reachable"] else "unreachable"
             
-            health["status"] = "healthy"
-            health["message"] = "All components operational"
+            if ping["reachable"]:
+                health["status"] = "healthy"
+                health["message"] = "All components operational"
+            else:
+                health["status"] = "unhealthy"
+                health["message"] = f"Database unreachable: {ping['error']}"
         
         except Exception as e:
             health["status"] = "unhealthy"
             health["message"] = f"Health check failed: {str(e)}"
-            self.logger.error(f"Health check failed: {str(e)}")
+            self.logger.error("Health check failed: %s", e)
         
         return health
 
 
 # Global orchestrator instance (singleton pattern)
 _orchestrator_instance = None
+_orchestrator_lock = threading.Lock()
 
 
 def get_orchestrator(llm=None) -> WorkflowOrchestrator:
@@ -157,6 +275,8 @@ def get_orchestrator(llm=None) -> WorkflowOrchestrator:
     global _orchestrator_instance
     
     if _orchestrator_instance is None:
-        _orchestrator_instance = WorkflowOrchestrator(llm)
+        with _orchestrator_lock:
+            if _orchestrator_instance is None:
+                _orchestrator_instance = WorkflowOrchestrator(llm)
     
     return _orchestrator_instance
@@ -6,7 +6,7 @@ This workflow runs autonomously to identify:
 2. Predicted stock shortfalls based on enrollment trends
 """
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from src.agents import (
@@ -32,14 +32,26 @@ class SupplyWatchdogWorkflow:
     5. Synthesis Agent generates JSON output
     """
     
-    def __init__(self, llm=None):
-        """Initialize workflow with all required agents."""
+    def __init__(
+        self,
+        llm=None,
+        router: Optional[RouterAgent] = None,
+        synthesis: Optional[SynthesisAgent] = None
+    ):
+        """
+        Initialize workflow with all required agents.
+        
+        Args:
+            llm: Language model instance (optional)
+            router: Shared RouterAgent to reuse (optional)
+            synthesis: Shared SynthesisAgent to reuse (optional)
+        """
         self.llm = llm
-        self.router = RouterAgent(llm)
+        self.router = router or RouterAgent(llm)
         self.schema_retrieval = SchemaRetrievalAgent(llm)
         self.inventory = InventoryAgent(llm)
         self.demand = DemandForecastingAgent(llm)
-        self.synthesis = SynthesisAgent(llm)
+        self.synthesis = synthesis or SynthesisAgent(llm)
         self.logger = logging.getLogger("workflow.supply_watchdog")
     
     def execute(self, trigger_type: str = "manual") -> Dict[str, Any]:
@@ -53,7 +65,7 @@ class SupplyWatchdogWorkflow:
             Dictionary with JSON output and metadata
         """
         try:
-            self.logger.info(f"Starting Supply Watchdog workflow (trigger: {trigger_type})")
+            self.logger.info("Starting Supply Watchdog workflow (trigger: %s)", trigger_type)
             
             # Step 1: Route request
             routing_result = self.router.execute({
@@ -0,0 +1,121 @@
+"""
+Tests for ChromaSchemaManagerOpenAI search, sync and query-embedding caches.
+
+The ChromaDB collection and OpenAI client are replaced with stubs, so no
+API key or network access is needed. Skipped when chromadb or openai is
+not installed.
+"""
+
+
+def test_search_schema_index_ranks_by_cosine_similarity(chroma_manager):
+    manager = chroma_manager({
+        "shipments": [0.0, 1.0],
+        "inventory": [10.0, 0.0],
+        "demand": [1.0, 1.0],
+    })
+
+    results = manager._search_schema_index([1.0, 0.1], n_results=2)
+
+    assert results["ids"] == [["inventory", "demand"]]
+    distances = results["distances"][0]
+    assert distances[0] < distances[1]
+    assert results["metadatas"] == [[{"table_name": "inventory"}, {"table_name": "demand"}]]
+
+
+def test_search_schema_index_returns_all_when_fewer_tables(chroma_manager):
+    manager = chroma_manager({"inventory": [1.0, 0.0], "demand": [0.0, 1.0]})
+    assert manager._search_schema_index([0.0, 1.0], n_results=5)["ids"] == [["demand", "inventory"]]
+
+
+def test_search_schema_index_rejects_zero_query(chroma_manager):
+    manager = chroma_manager({"inventory": [1.0, 0.0]})
+    assert manager._search_schema_index([0.0, 0.0], n_results=1) is None
+
+
+def test_sync_that_only_removes_tables_rebuilds_the_index(chroma_manager):
+    manager = chroma_manager()
+    ids, documents, metadatas = manager._build_schema_entries()
+    manager.collection.embeddings = {table: [1.0, 0.0] for table in ids}
+    manager.collection.embeddings["retired_table"] = [0.0, 1.0]
+    manager.collection.metadatas = dict(zip(ids, metadatas))
+    manager.collection.metadatas["retired_table"] = {"table_name": "retired_table"}
+    assert "retired_table" in manager._search_schema_index([0.0, 1.0], n_results=1)["ids"][0]
+
+    manager._sync_schemas()
+
+    assert manager.openai_client.embeddings.calls == []
+    assert "retired_table" not in manager._search_schema_index([0.0, 1.0], n_results=1)["ids"][0]
+
+
+def test_embed_queries_batches_misses_and_caches_in_memory(chroma_manager):
+    manager = chroma_manager()
+    calls = manager.openai_client.embeddings.calls
+
+    first = manager.embed_queries(["stock  levels", "demand", "stock levels"])
+    assert calls == [["stock levels", "demand"]]
+    assert first[0] == first[2]
+
+    manager.embed_queries(["demand"])
+    assert len(calls) == 1
+
+
+def test_embed_queries_reuses_disk_cache_across_instances(chroma_manager):
+    chroma_manager().embed_queries(["stock levels"])
+
+    restarted = chroma_manager()
+    assert restarted.embed_queries(["stock levels"]) == [[12.0, 1.0]]
+    assert restarted.openai_client.embeddings.calls == []
+
+
+def test_embed_queries_evicts_least_recently_used(chroma_manager):
+    manager = chroma_manager()
+    manager.QUERY_EMBEDDING_CACHE_SIZE = 2
+    for query in ["a", "b", "a", "c"]:
+        manager.embed_queries([query])
+    assert list(manager._query_embedding_cache) == ["a", "c"]
+
+
+def test_disk_cache_keeps_only_the_newest_rows(chroma_manager):
+    manager = chroma_manager()
+    manager.QUERY_EMBEDDING_DB_MAX_ROWS = 2
+    for query in ["a", "bb", "ccc"]:
+        manager.embed_queries([query])
+
+    stored = chroma_manager()._load_stored_query_embeddings(["a", "bb", "ccc"])
+    assert sorted(stored) == ["bb", "ccc"]
+
+
+def test_sync_backfills_hashes_without_reembedding_unchanged_schemas(chroma_manager):
+    ids, documents, metadatas = chroma_manager()._build_schema_entries()
+    # A collection built before content hashes were stored; one table's
+    # schema has changed since, one table was dropped from the registry
+    manager = chroma_manager(
+        {table: [1.0, 0.0] for table in ids + ["retired_table"]},
+        documents={**dict(zip(ids, documents)), ids[0]: "outdated document", "retired_table": "old"},
+    )
+
+    manager._sync_schemas()
+
+    assert manager.openai_client.embeddings.calls == [[documents[0]]]
+    assert manager.collection.upserted == [ids[0]]
+    assert "retired_table" not in manager.collection.embeddings
+    assert all(
+        manager.collection.metadatas[table]["content_hash"] == metadata["content_hash"]
+        for table, metadata in zip(ids, metadatas)
+    )
+
+
+def test_large_catalog_skips_flat_search_until_collection_changes(chroma_manager, monkeypatch):
+    manager = chroma_manager({"inventory": [1.0, 0.0], "demand": [0.0, 1.0]})
+    manager.FLAT_SEARCH_MAX_TABLES = 1
+    counts = []
+    count = manager.collection.count
+    monkeypatch.setattr(manager.collection, "count", lambda: counts.append(1) or count())
+
+    assert manager._search_schema_index([1.0, 0.0], n_results=1) is None
+    assert manager._search_schema_index([1.0, 0.0], n_results=1) is None
+    assert len(counts) == 1
+
+    manager.FLAT_SEARCH_MAX_TABLES = 10
+    manager._schema_index = None  # as after a sync or refresh
+    assert manager._search_schema_index([1.0, 0.0], n_results=1)["ids"] == [["inventory"]]
@@ -0,0 +1,130 @@
+"""
+Tests for DatabaseTools query execution helpers.
+
+A fake connection stands in for PostgreSQL, so no database is needed.
+"""
+import threading
+
+import pytest
+
+from src.config.settings import settings
+from src.tools import database_tools
+
+
+def _query_count(conn, query):
+    return sum(1 for executed in conn.executed if executed == query)
+
+
+def test_cache_hit_skips_database(db):
+    first = db.execute_query("SELECT a FROM t")
+    second = db.execute_query("SELECT a FROM t")
+    assert first["data"] == second["data"] == [{"a": 1}]
+    assert _query_count(db.conn, "SELECT a FROM t") == 1
+
+
+def test_cached_rows_are_not_shared_with_callers(db):
+    first = db.execute_query("SELECT a FROM t")
+    first["data"][0]["severity"] = "CRITICAL"
+
+    second = db.execute_query("SELECT a FROM t")
+    assert second["data"] == [{"a": 1}]
+    assert _query_count(db.conn, "SELECT a FROM t") == 1
+
+    second["data"][0]["severity"] = "HIGH"
+    assert db.execute_query("SELECT a FROM t")["data"] == [{"a": 1}]
+
+
+@pytest.mark.parametrize("query", [
+    "INSERT INTO t (a) VALUES (1) RETURNING a",
+    "UPDATE t SET a = 2 RETURNING a",
+    "WITH moved AS (DELETE FROM t RETURNING a) SELECT a FROM moved",
+    "SELECT a FROM t FOR UPDATE",
+])
+def test_writes_are_never_cached(db, query):
+    db.execute_query(query)
+    db.execute_query(query)
+    assert _query_count(db.conn, query) == 2
+
+
+def test_cache_disabled_by_default_ttl(db, monkeypatch):
+    monkeypatch.setattr(settings, "query_cache_ttl", 0)
+    db.execute_query("SELECT a FROM t")
+    db.execute_query("SELECT a FROM t")
+    assert _query_count(db.conn, "SELECT a FROM t") == 2
+
+
+def test_execute_queries_rolls_back_only_the_failing_query(db):
+    results = db.execute_queries([
+        "UPDATE t SET a = 2",
+        ("SELECT BAD FROM t", (1,)),
+        "SELECT a FROM t",
+    ])
+    assert [result["success"] for result in results] == [True, False, True]
+
+    # The failure is undone back to its own savepoint, not the whole batch
+    executed = db.conn.executed
+    assert "ROLLBACK" not in executed
+    failed_at = executed.index("SELECT BAD FROM t")
+    assert executed[failed_at + 1] == "ROLLBACK TO SAVEPOINT batch_statement"
+    assert executed[failed_at - 1] == "SAVEPOINT batch_statement"
+
+
+def test_get_connection_replaces_dead_pooled_connection(pooled_db):
+    tools, pool = pooled_db(dead=(True, False), max_connections=2)
+    dead, live = pool.conns
+
+    with tools.get_connection() as conn:
+        assert conn is live
+    assert pool.returned == [(dead, True), (live, False)]
+
+
+def test_get_connection_waits_for_a_free_slot(pooled_db):
+    tools, _ = pooled_db(dead=(False, False), max_connections=1)
+    second_checked_out = threading.Event()
+
+    def borrow():
+        with tools.get_connection():
+            second_checked_out.set()
+
+    with tools.get_connection():
+        waiter = threading.Thread(target=borrow)
+        waiter.start()
+        # With one slot taken, the second caller blocks rather than erroring
+        assert not second_checked_out.wait(0.1)
+    waiter.join(1)
+    assert second_checked_out.is_set()
+
+
+def test_recently_returned_connection_is_not_pinged(pooled_db):
+    tools, pool = pooled_db(dead=(False,))
+    with tools.get_connection() as conn:
+        pass
+    pool.conns.append(conn)
+    conn.executed.clear()
+
+    with tools.get_connection() as conn:
+        pass
+    assert conn.executed == ["COMMIT"]
+
+
+def test_closed_connection_is_replaced_without_ping(pooled_db):
+    tools, pool = pooled_db(dead=(False, False), max_connections=2)
+    closed, live = pool.conns
+    closed.closed = 1
+
+    with tools.get_connection() as conn:
+        assert conn is live
+    assert closed.executed == []
+    assert pool.returned == [(closed, True), (live, False)]
+
+
+def test_pool_and_engine_share_the_connection_limit(monkeypatch):
+    created = {}
+    monkeypatch.setattr(database_tools, "ThreadedConnectionPool", lambda **kwargs: created.update(kwargs) or kwargs)
+    monkeypatch.setattr(settings, "db_pool_max_connections", 10)
+    monkeypatch.setattr(settings, "db_engine_pool_size", 3)
+    tools = database_tools.DatabaseTools()
+
+    tools._get_pool()
+    assert tools.engine.pool.size() == 3
+    assert created["maxconn"] == 7
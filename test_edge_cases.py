@@ -5,161 +5,122 @@ Tests:
 1. Ambiguous Entity Names (Fuzzy Matching)
 2. SQL Query Errors (Self-Healing)
 3. Missing Data Scenarios
+
+Run with pytest (tests are independent, so `pytest -n auto` works).
 """
-import sys
-sys.path.insert(0, '.')
+import logging
 
 from src.tools.fuzzy_matching import FuzzyMatcher, resolve_batch_id, resolve_trial_name
 from src.tools.sql_validator import SQLValidator
 from src.utils.error_handlers import SQLErrorHandler, AgentErrorHandler
 
-print("=" * 70)
-print("EDGE CASE TESTING - Assignment Part 3")
-print("=" * 70)
+# Detailed inputs/results are debug output; run with --log-level=DEBUG to see them
+logger = logging.getLogger(__name__)
+
 
 # ============================================================================
 # EDGE CASE 1: Ambiguous Entity Names (Fuzzy Matching)
 # ============================================================================
-print("\n" + "=" * 70)
-print("EDGE CASE 1: Ambiguous Entity Names")
-print("=" * 70)
-
-fuzzy = FuzzyMatcher()
-
-# Test 1.1: User says "LOT 14364098" but DB has "LOT-14364098"
-print("\n--- Test 1.1: Batch ID with missing hyphen ---")
-candidates = ["LOT-14364098", "LOT-14364099", "LOT-45953393", "LOT-86533765"]
-result = resolve_batch_id("LOT 14364098", candidates)
-print(f"Query: 'LOT 14364098'")
-print(f"Candidates: {candidates}")
-print(f"Result: {result}")
-print(f"✓ PASS" if result["matched_value"] == "LOT-14364098" and result["confidence"] >= 80 else "✗ FAIL")
-
-# Test 1.2: User says "Trial ABC" but DB has "Trial_ABC_v2"
-print("\n--- Test 1.2: Trial name with version suffix ---")
-candidates = ["Trial_ABC_v2", "Trial-ABC-v1", "Trial_ABC_old", "Trial_XYZ"]
-result = resolve_trial_name("Trial ABC", candidates)
-print(f"Query: 'Trial ABC'")
-print(f"Candidates: {candidates}")
-print(f"Result: {result}")
-print(f"Match type: {result['match_type']}, Confidence: {result['confidence']}")
-
-# Test 1.3: Exact match (case-insensitive)
-print("\n--- Test 1.3: Case-insensitive exact match ---")
-candidates = ["Germany", "France", "Japan", "Zimbabwe"]
-result = fuzzy.resolve_entity("germany", candidates, "country")
-print(f"Query: 'germany'")
-print(f"Result: {result}")
-print(f"✓ PASS" if result["matched_value"] == "Germany" and result["confidence"] >= 95 else "✗ FAIL")
-
-# Test 1.4: No match found
-print("\n--- Test 1.4: No match scenario ---")
-candidates = ["LOT-14364098", "LOT-14364099"]
-result = resolve_batch_id("BATCH-999999", candidates)
-print(f"Query: 'BATCH-999999'")
-print(f"Result: {result}")
-print(f"✓ PASS" if result["action"] in ["request_clarification", "show_options"] else "✗ FAIL")
+
+def test_batch_id_missing_hyphen():
+    """User says "LOT 14364098" but DB has "LOT-14364098"."""
+    candidates = ["LOT-14364098", "LOT-14364099", "LOT-45953393", "LOT-86533765"]
+    result = resolve_batch_id("LOT 14364098", candidates)
+    logger.debug("Candidates: %s", candidates)
+    logger.debug("Result: %s", result)
+    assert result["matched_value"] == "LOT-14364098"
+    assert result["confidence"] >= 80
+
+
+def test_trial_name_version_suffix():
+    """User says "Trial ABC" but DB has "Trial_ABC_v2"."""
+    candidates = ["Trial_ABC_v2", "Trial-ABC-v1", "Trial_ABC_old", "Trial_XYZ"]
+    result = resolve_trial_name("Trial ABC", candidates)
+    logger.debug("Candidates: %s", candidates)
+    logger.debug("Result: %s", result)
+    assert result["matched_value"] in candidates
+    assert result["match_type"] != "no_match"
+
+
+def test_case_insensitive_exact_match():
+    candidates = ["Germany", "France", "Japan", "Zimbabwe"]
+    result = FuzzyMatcher().resolve_entity("germany", candidates, "country")
+    logger.debug("Result: %s", result)
+    assert result["matched_value"] == "Germany"
+    assert result["confidence"] >= 95
+
+
+def test_no_match():
+    candidates = ["LOT-14364098", "LOT-14364099"]
+    result = resolve_batch_id("BATCH-999999", candidates)
+    logger.debug("Result: %s", result)
+    assert result["action"] in ["request_clarification", "show_options"]
+
 
 # ============================================================================
 # EDGE CASE 2: SQL Query Errors (Self-Healing)
 # ============================================================================
-print("\n" + "=" * 70)
-print("EDGE CASE 2: SQL Query Errors (Self-Healing)")
-print("=" * 70)
-
-# Test 2.1: Date column without casting
-print("\n--- Test 2.1: Auto-fix date column casting ---")
-bad_query = """
-SELECT lot, expiry_date, location 
-FROM available_inventory_report 
+
+def test_date_column_casting_autofix():
+    bad_query = """
+SELECT lot, expiry_date, location
+FROM available_inventory_report
 WHERE expiry_date < CURRENT_DATE + INTERVAL '90 days'
 ORDER BY expiry_date
 """
-report = SQLValidator.get_validation_report(bad_query)
-print(f"Original: {bad_query.strip()[:80]}...")
-print(f"Was modified: {report['was_modified']}")
-print(f"Fixes applied: {report['fixes_applied']}")
-print(f"Fixed query contains ::DATE: {'::DATE' in report['fixed_query']}")
-print(f"✓ PASS" if report['was_modified'] and '::DATE' in report['fixed_query'] else "✗ FAIL")
-
-# Test 2.2: Error translation
-print("\n--- Test 2.2: Error translation ---")
-error_code = "42703"
-error_msg = 'column "expiry" does not exist'
-translated = SQLErrorHandler.translate_error(error_code, error_msg)
-print(f"Error code: {error_code}")
-print(f"Raw message: {error_msg}")
-print(f"Translated: {translated}")
-print(f"✓ PASS" if "Column does not exist" in translated else "✗ FAIL")
-
-# Test 2.3: Fix suggestion
-print("\n--- Test 2.3: Fix suggestion ---")
-suggestion = SQLErrorHandler.suggest_fix("42703", error_msg, "SELECT expiry FROM table")
-print(f"Suggestion: {suggestion}")
-print(f"✓ PASS" if suggestion and "column" in suggestion.lower() else "✗ FAIL")
-
-# Test 2.4: Syntax validation
-print("\n--- Test 2.4: Syntax validation ---")
-valid_query = "SELECT * FROM table WHERE id = 1"
-invalid_query = "SELEC * FROM table"
-is_valid1, _ = SQLValidator.validate_query_syntax(valid_query)
-is_valid2, error = SQLValidator.validate_query_syntax(invalid_query)
-print(f"Valid query check: {is_valid1}")
-print(f"Invalid query check: {is_valid2}, Error: {error}")
-print(f"✓ PASS" if is_valid1 and not is_valid2 else "✗ FAIL")
+    report = SQLValidator.get_validation_report(bad_query)
+    logger.debug("Original: %.80s...", bad_query.strip())
+    logger.debug("Fixes applied: %s", report['fixes_applied'])
+    assert report['was_modified']
+    assert '::DATE' in report['fixed_query']
+
+
+def test_error_translation():
+    error_msg = 'column "expiry" does not exist'
+    translated = SQLErrorHandler.translate_error("42703", error_msg)
+    logger.debug("Raw message: %s", error_msg)
+    logger.debug("Translated: %s", translated)
+    assert "Column does not exist" in translated
+
+
+def test_fix_suggestion():
+    error_msg = 'column "expiry" does not exist'
+    suggestion = SQLErrorHandler.suggest_fix("42703", error_msg, "SELECT expiry FROM table")
+    logger.debug("Suggestion: %s", suggestion)
+    assert suggestion and "column" in suggestion.lower()
+
+
+def test_syntax_validation():
+    is_valid, _ = SQLValidator.validate_query_syntax("SELECT * FROM table WHERE id = 1")
+    assert is_valid
+
+    is_valid, error = SQLValidator.validate_query_syntax("SELEC * FROM table")
+    logger.debug("Invalid query error: %s", error)
+    assert not is_valid
+
 
 # ============================================================================
 # EDGE CASE 3: Missing Data Scenarios
 # ============================================================================
-print("\n" + "=" * 70)
-print("EDGE CASE 3: Missing Data Scenarios")
-print("=" * 70)
-
-# Test 3.1: Missing data message generation
-print("\n--- Test 3.1: Missing data message ---")
-message = AgentErrorHandler.handle_missing_data(
-    entity_type="batch",
-    entity_value="LOT-999999",
-    tables_checked=["available_inventory_report", "allocated_materials_to_orders", "re_evaluation"]
-)
-print(f"Message:\n{message}")
-print(f"✓ PASS" if "LOT-999999" in message and "available_inventory_report" in message else "✗ FAIL")
-
-# Test 3.2: Conflicting data message
-print("\n--- Test 3.2: Conflicting data message ---")
-conflicts = [
-    {"table": "available_inventory_report", "value": "500 units", "updated": "2025-12-24 06:00"},
-    {"table": "allocated_materials_to_orders", "value": "450 units", "updated": "2025-12-23 18:00"}
-]
-message = AgentErrorHandler.handle_conflicting_data("Material MAT-60599", conflicts)
-print(f"Message:\n{message}")
-print(f"✓ PASS" if "500 units" in message and "450 units" in message else "✗ FAIL")
 
-# ============================================================================
-# SUMMARY
-# ============================================================================
-print("\n" + "=" * 70)
-print("EDGE CASE TESTING COMPLETE")
-print("=" * 70)
-print("""
-Summary of Edge Case Handling:
-
-1. FUZZY MATCHING (Ambiguous Entity Names):
-   ✓ Handles missing hyphens (LOT 14364098 → LOT-14364098)
-   ✓ Case-insensitive matching (germany → Germany)
-   ✓ Confidence scoring (high/medium/low)
-   ✓ Graceful handling when no match found
-
-2. SELF-HEALING SQL:
-   ✓ Auto-fixes TEXT date column casting
-   ✓ Translates PostgreSQL errors to user-friendly messages
-   ✓ Provides fix suggestions
-   ✓ Validates SQL syntax
-
-3. MISSING DATA:
-   ✓ Generates helpful messages listing tables checked
-   ✓ Explains possible reasons for missing data
-   ✓ Handles conflicting data across tables
-
-All edge cases from Assignment Part 3 are implemented!
-""")
+def test_missing_data_message():
+    message = AgentErrorHandler.handle_missing_data(
+        entity_type="batch",
+        entity_value="LOT-999999",
+        tables_checked=["available_inventory_report", "allocated_materials_to_orders", "re_evaluation"]
+    )
+    logger.debug("Message:\n%s", message)
+    assert "LOT-999999" in message
+    assert "available_inventory_report" in message
+
+
+def test_conflicting_data_message():
+    conflicts = [
+        {"table": "available_inventory_report", "value": "500 units", "updated": "2025-12-24 06:00"},
+        {"table": "allocated_materials_to_orders", "value": "450 units", "updated": "2025-12-23 18:00"}
+    ]
+    message = AgentErrorHandler.handle_conflicting_data("Material MAT-60599", conflicts)
+    logger.debug("Message:\n%s", message)
+    assert "500 units" in message
+    assert "450 units" in message
+
@@ -0,0 +1,54 @@
+"""
+Tests for the ResponseReplay record/replay store.
+"""
+import json
+from datetime import date
+
+from src.utils.response_replay import ResponseReplay
+
+
+def test_replays_recorded_response_across_instances(tmp_path):
+    path = tmp_path / "fixtures" / "responses.json"
+    ResponseReplay(str(path)).record("Which lots expire soon?", {"success": True, "tables": ["re_evaluation"]})
+
+    replay = ResponseReplay(str(path))
+    assert replay.get("Which lots expire soon?") == {"success": True, "tables": ["re_evaluation"]}
+
+
+def test_query_whitespace_is_normalized(tmp_path):
+    replay = ResponseReplay(str(tmp_path / "responses.json"))
+    replay.record("  Which lots\n expire   soon? ", {"success": True})
+    assert replay.get("Which lots expire soon?") == {"success": True}
+
+
+def test_unrecorded_query_returns_none(tmp_path):
+    assert ResponseReplay(str(tmp_path / "responses.json")).get("anything") is None
+
+
+def test_get_returns_a_deep_copy(tmp_path):
+    replay = ResponseReplay(str(tmp_path / "responses.json"))
+    replay.record("query", {"success": True, "metadata": {"tables": ["re_evaluation"]}})
+
+    replayed = replay.get("query")
+    replayed["success"] = False
+    replayed["metadata"]["tables"].append("inventory")
+    assert replay.get("query") == {"success": True, "metadata": {"tables": ["re_evaluation"]}}
+
+
+def test_context_is_part_of_the_key(tmp_path):
+    replay = ResponseReplay(str(tmp_path / "responses.json"))
+    replay.record("stock levels", {"site": "Germany"}, context={"country": "Germany"})
+    replay.record("stock levels", {"site": "Japan"}, context={"country": "Japan"})
+
+    assert replay.get("stock levels", {"country": "Japan"}) == {"site": "Japan"}
+    assert replay.get("stock levels", {"country": "Germany"}) == {"site": "Germany"}
+    assert replay.get("stock levels") is None
+
+
+def test_non_json_values_are_stored_as_strings(tmp_path):
+    path = tmp_path / "responses.json"
+    ResponseReplay(str(path)).record("query", {"as_of": date(2025, 12, 24)})
+
+    assert ResponseReplay(str(path)).get("query") == {"as_of": "2025-12-24"}
+    assert len(json.loads(path.read_text(encoding="utf-8"))) == 1
+
@@ -0,0 +1,38 @@
+"""
+Tests for RouterAgent query-type detection.
+"""
+import pytest
+
+from src.agents.router_agent import QUERY_TYPE_KEYWORDS, detect_query_types
+
+
+def _scan_keywords(query):
+    """The per-type any() substring scans the regex replaced."""
+    return {
+        query_type for query_type, keywords in QUERY_TYPE_KEYWORDS.items()
+        if any(keyword in query for keyword in keywords)
+    }
+
+
+@pytest.mark.parametrize("query", [
+    "",
+    "what is the weather today",
+    "can we extend the shelf-life of lot-14364098?",
+    "extension approved in germany?",
+    "show pending shipments and outstanding orders",
+    "predict demand and enrollment forecast for zimbabwe",
+    "available stock quantity by supplier",
+    "regulatory compliance approval timeline",
+    "shipping transport timeline to japan",
+    "extendextension",
+    "shelf-life expiry extension with approved regulatory approval",
+])
+def test_detect_query_types_matches_keyword_scan(query):
+    assert detect_query_types(query) == _scan_keywords(query)
+
+
+def test_detect_query_types_matches_every_keyword():
+    for query_type, keywords in QUERY_TYPE_KEYWORDS.items():
+        for keyword in keywords:
+            assert query_type in detect_query_types(f"about {keyword}?")
+
@@ -0,0 +1,54 @@
+"""
+Tests for SynthesisAgent helpers.
+
+The LLM is replaced with a stub, so no OpenAI access is needed.
+"""
+
+
+def test_stream_reasoning_skips_empty_chunks(synthesis_agent):
+    agent = synthesis_agent(["Stock ", None, "", "is low."])
+    assert "".join(agent._stream_reasoning("prompt", "data", "query")) == "Stock is low."
+
+
+def test_stream_reasoning_falls_back_before_first_chunk(synthesis_agent, monkeypatch):
+    agent = synthesis_agent(error=RuntimeError("rate limited"))
+    monkeypatch.setattr(agent, "_format_general_response", lambda data, query: "fallback")
+    assert list(agent._stream_reasoning("prompt", "data", "query")) == ["fallback"]
+
+
+def test_stream_reasoning_notes_mid_stream_failure(synthesis_agent):
+    agent = synthesis_agent(["Stock "], error=RuntimeError("connection reset"))
+    chunks = list(agent._stream_reasoning("prompt", "data", "query"))
+    assert chunks[0] == "Stock "
+    assert "cut short" in chunks[-1]
+
+
+def test_collect_all_citations_dedupes_same_evidence(synthesis_agent):
+    agent_outputs = {
+        "inventory": {"citations": [
+            {"table": "available_inventory_report", "columns": ["lot", "location"], "batch_id": "LOT-1"},
+            {"table": "re_evaluation", "columns": None},
+        ]},
+        "regulatory": {"citations": [
+            {"table": "available_inventory_report", "columns": ["location", "lot"], "batch_id": "LOT-1"},
+            {"table": "available_inventory_report", "columns": ["lot", "location"], "batch_id": "LOT-2"},
+            {"table": "re_evaluation"},
+        ]},
+        "schema": "not an agent result",
+    }
+    agent = synthesis_agent()
+
+    assert len(agent._collect_all_citations(agent_outputs)) == 5
+    assert agent._collect_all_citations(agent_outputs, dedupe=True) == [
+        {"table": "available_inventory_report", "columns": ["lot", "location"], "batch_id": "LOT-1"},
+        {"table": "re_evaluation", "columns": None},
+        {"table": "available_inventory_report", "columns": ["lot", "location"], "batch_id": "LOT-2"},
+    ]
+
+
+def test_collect_all_citations_keeps_different_row_counts(synthesis_agent):
+    agent_outputs = {
+        "demand": {"citations": [{"table": "enrollment_rate_report", "columns": ["country"], "row_count": 3}]},
+        "inventory": {"citations": [{"table": "enrollment_rate_report", "columns": ["country"], "row_count": 7}]},
+    }
+    assert len(synthesis_agent()._collect_all_citations(agent_outputs, dedupe=True)) == 2